@@ -0,0 +1,317 @@
+"""Versioned backups of character saves.
+
+Every version the editor writes (and the file as it was before the first
+write) is kept in a ``.rsd_backups`` folder beside the saves. Files are cut
+into one chunk per top-level entry; chunks are zlib-compressed and stored
+under their SHA-1, so versions share every section they did not change and
+characters in the same folder share identical sections too. Each save has
+an append-only manifest of its versions, one JSON object per line:
+
+    {"n": 3, "t": 1717171717.0, "size": 8391, "chunks": [[key, sha1, value offset], ...]}
+
+Retention keeps the newest ``RSD_BACKUP_KEEP`` versions (default 50), drops
+versions older than ``RSD_BACKUP_DAYS`` if set, and always keeps the first
+version, the file as the editor first found it. Chunks no version refers to
+any more are deleted now and then, not on every prune.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+
+from save_sections import SaveFormatError, scan_sections
+
+BACKUP_DIRNAME = ".rsd_backups"
+BACKUP_KEEP = int(os.environ.get("RSD_BACKUP_KEEP", "50"))
+BACKUP_MAX_DAYS = float(os.environ.get("RSD_BACKUP_DAYS", "0"))
+# Level 1 is twice as fast as the default on save JSON and only ~20% larger
+COMPRESS_LEVEL = 1
+# Unreferenced chunks are swept after this many prunes in one process, or by
+# `backups --gc`; chunks younger than the grace period may belong to a
+# snapshot another process has not yet added to its manifest
+GC_EVERY_PRUNES = 50
+GC_GRACE_SECONDS = 3600
+
+_prunes_since_gc = 0
+
+
+class BackupVersionError(ValueError):
+    """Raised when a save has no stored version with the requested number."""
+
+
+class BackupVersion:
+    __slots__ = ("number", "time", "size", "chunks")
+
+    def __init__(self, number, time, size, chunks):
+        self.number = number
+        self.time = time
+        self.size = size
+        # [(top-level key or None, sha1 hex, offset of the value within the chunk)]
+        self.chunks = chunks
+
+    def to_json(self):
+        return json.dumps({"n": self.number, "t": self.time, "size": self.size,
+                           "chunks": [list(chunk) for chunk in self.chunks]})
+
+    @classmethod
+    def from_json(cls, line):
+        entry = json.loads(line)
+        return cls(entry["n"], entry["t"], entry["size"], [tuple(chunk) for chunk in entry["chunks"]])
+
+    def keys(self):
+        """top-level key -> chunk hash."""
+        return {key: digest for key, digest, _ in self.chunks if key is not None}
+
+
+def split_chunks(raw, sections=None):
+    """[(key, bytes, value offset)] covering ``raw`` end to end, one chunk per top-level entry.
+
+    A chunk runs from the end of the previous value to the end of its own, so
+    it carries the separator and key before the value. Files whose layout
+    cannot be scanned become a single chunk.
+    """
+    if sections is None:
+        try:
+            sections, _ = scan_sections(raw)
+        except SaveFormatError:
+            return [(None, memoryview(raw), 0)]
+    view = memoryview(raw)
+    chunks = []
+    pos = 0
+    for section in sections:
+        chunks.append((section.key, view[pos:section.end], section.start - pos))
+        pos = section.end
+    chunks.append((None, view[pos:], 0))
+    return chunks
+
+
+class BackupStore:
+    def __init__(self, directory, keep=BACKUP_KEEP, max_days=BACKUP_MAX_DAYS):
+        self.directory = directory
+        self.keep = keep
+        self.max_days = max_days
+
+    @classmethod
+    def for_save(cls, path):
+        return cls(os.path.join(os.path.dirname(os.path.abspath(path)), BACKUP_DIRNAME))
+
+    def _manifest_path(self, path):
+        return os.path.join(self.directory, os.path.basename(path) + ".versions")
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.directory, "chunks", digest[:2], digest[2:])
+
+    def versions(self, path):
+        """Every stored version of ``path``, oldest first."""
+        try:
+            with open(self._manifest_path(path), "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        versions = []
+        for line in lines:
+            try:
+                versions.append(BackupVersion.from_json(line))
+            except (ValueError, KeyError, TypeError):
+                # A torn last line from a crash mid-append
+                continue
+        return versions
+
+    def version(self, path, number):
+        for version in self.versions(path):
+            if version.number == number:
+                return version
+        raise BackupVersionError(f"No backup version {number} of {os.path.basename(path)}.")
+
+    def _put_chunk(self, digest, data):
+        chunk_path = self._chunk_path(digest)
+        if os.path.exists(chunk_path):
+            return 0
+        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+        packed = zlib.compress(data, COMPRESS_LEVEL)
+        # Kit workers backing up identical saves race to write the same chunk,
+        # so each writer gets its own temp file
+        fd, tmp_path = tempfile.mkstemp(prefix=digest[2:8], suffix=".tmp", dir=os.path.dirname(chunk_path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(packed)
+            os.replace(tmp_path, chunk_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            # Another writer got there first with the same content
+            if os.path.exists(chunk_path):
+                return 0
+            raise
+        return len(packed)
+
+    def _get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha1(data).hexdigest() != digest:
+            raise ValueError(f"Backup chunk {digest} is corrupt.")
+        return data
+
+    def snapshot(self, path, raw, sections=None, known=None):
+        """Store ``raw`` as the newest version of ``path``.
+
+        ``known`` maps top-level keys to the hashes of chunks the caller knows
+        are unchanged since its last snapshot; only the other chunks are hashed,
+        and only chunks not already in the store are compressed and written.
+        Returns the BackupVersion holding ``raw`` (the newest one if it matches).
+        """
+        known = known or {}
+        chunks = []
+        for key, data, offset in split_chunks(raw, sections):
+            digest = known.get(key) if key is not None else None
+            chunks.append((key, digest or hashlib.sha1(data).hexdigest(), offset, data if digest is None else None))
+        versions = self.versions(path)
+        latest = versions[-1] if versions else None
+        entries = [(key, digest, offset) for key, digest, offset, _ in chunks]
+        if latest is not None and latest.chunks == entries:
+            return latest
+
+        for _, digest, _, data in chunks:
+            if data is not None:
+                self._put_chunk(digest, data)
+        version = BackupVersion(latest.number + 1 if latest else 1, round(time.time(), 3), len(raw), entries)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._manifest_path(path), "a", encoding="utf-8") as f:
+            f.write(version.to_json() + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        versions.append(version)
+        self._prune(path, versions)
+        return version
+
+    def read(self, path, number):
+        """The bytes of one stored version."""
+        return b"".join(self._get_chunk(digest) for _, digest, _ in self.version(path, number).chunks)
+
+    def _section_value(self, version, key):
+        for chunk_key, digest, offset in version.chunks:
+            if chunk_key == key:
+                return json.loads(self._get_chunk(digest)[offset:])
+        return None
+
+    def diff(self, path, old, new=None):
+        """Changes from version ``old`` to version ``new`` (default: the file on disk now).
+
+        Returns [(key, slot or None, old value, new value)]. Inventory and
+        Loadout are compared slot by slot; other top-level entries are reported
+        whole, with their sizes in bytes (None where the entry is missing).
+        """
+        from save_core import EDITED_SECTIONS
+
+        old_version = self.version(path, old)
+        if new is None:
+            with open(path, "rb") as f:
+                current = f.read()
+            chunks = split_chunks(current)
+            new_keys = {key: hashlib.sha1(data).hexdigest() for key, data, _ in chunks if key is not None}
+            new_values = {key: (data, offset) for key, data, offset in chunks}
+            new_size = {key: len(data) for key, data, _ in chunks}
+
+            def new_value(key):
+                data, offset = new_values[key]
+                return json.loads(bytes(data[offset:]))
+        else:
+            new_version = self.version(path, new)
+            new_keys = new_version.keys()
+            new_size = {}
+
+            def new_value(key):
+                return self._section_value(new_version, key)
+
+        old_keys = old_version.keys()
+        changes = []
+        for key in list(old_keys) + [k for k in new_keys if k not in old_keys]:
+            if old_keys.get(key) == new_keys.get(key):
+                continue
+            if key in EDITED_SECTIONS and key in old_keys and key in new_keys:
+                before = self._section_value(old_version, key) or {}
+                after = new_value(key) or {}
+                for slot in sorted(before.keys() | after.keys(), key=lambda k: (not k.isdigit(), int(k) if k.isdigit() else 0, k)):
+                    if before.get(slot) != after.get(slot):
+                        changes.append((key, slot, before.get(slot), after.get(slot)))
+                continue
+            old_bytes = self._chunk_size(old_keys.get(key))
+            new_bytes = new_size.get(key) if new is None else self._chunk_size(new_keys.get(key))
+            changes.append((key, None, old_bytes, new_bytes))
+        return changes
+
+    def _chunk_size(self, digest):
+        return None if digest is None else len(self._get_chunk(digest))
+
+    def restore(self, path, number):
+        """Write version ``number`` back to ``path``, first storing what is there now."""
+        from save_core import atomic_write_bytes
+
+        payload = self.read(path, number)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.snapshot(path, f.read())
+        atomic_write_bytes(path, payload)
+        self.snapshot(path, payload)
+        return payload
+
+    def _prune(self, path, versions):
+        # The first and the newest versions always survive
+        cutoff = time.time() - self.max_days * 86400 if self.max_days else None
+        keep = {versions[0].number, versions[-1].number}
+        keep.update(v.number for v in versions[-max(self.keep, 1):] if cutoff is None or v.time >= cutoff)
+        if len(keep) == len(versions):
+            return
+        kept = [v for v in versions if v.number in keep]
+        manifest_path = self._manifest_path(path)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(manifest_path) + ".", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(v.to_json() + "\n" for v in kept)
+            os.replace(tmp_path, manifest_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        global _prunes_since_gc
+        _prunes_since_gc += 1
+        if _prunes_since_gc >= GC_EVERY_PRUNES:
+            _prunes_since_gc = 0
+            self.collect_garbage()
+
+    def collect_garbage(self, grace=GC_GRACE_SECONDS):
+        """Delete chunks no manifest refers to. Returns the number removed.
+
+        Chunks modified in the last ``grace`` seconds and temp files from
+        writes in flight are left alone.
+        """
+        referenced = set()
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".versions")]
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            for version in self.versions(os.path.join(self.directory, name[:-len(".versions")])):
+                referenced.update(digest for _, digest, _ in version.chunks)
+        removed = 0
+        cutoff = time.time() - grace
+        chunk_root = os.path.join(self.directory, "chunks")
+        for prefix in os.listdir(chunk_root) if os.path.isdir(chunk_root) else ():
+            for rest in os.listdir(os.path.join(chunk_root, prefix)):
+                if rest.endswith(".tmp") or prefix + rest in referenced:
+                    continue
+                chunk_path = os.path.join(chunk_root, prefix, rest)
+                try:
+                    if os.path.getmtime(chunk_path) > cutoff:
+                        continue
+                    os.remove(chunk_path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
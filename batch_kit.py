@@ -0,0 +1,138 @@
+"""Apply one inventory kit to many character saves at once.
+
+A kit is a JSON file mapping slots to items::
+
+    {
+        "inventory": {"8": {"item": "Bread", "count": 5}, "9": "Bronze Pickaxe"},
+        "loadout": {"Helmet": "Bronze Helmet"}
+    }
+
+Items must be given by exact name or PersistenceID, and loadout slots by
+index or by name. The kit is checked against the slot rules once, up front;
+the saves are then edited in parallel worker processes, each loading,
+applying and atomically writing its own file.
+"""
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from save_core import (
+    INVENTORY_SLOT_COUNT, LOADOUT_SLOT_NAMES, SaveDocument, SaveEditError,
+    check_inventory_slot, check_loadout_slot, clamp_count, load_item_list, resolve_item,
+)
+
+
+class Kit:
+    """A validated kit: (slot, PersistenceID, count) for inventory and (index, PersistenceID) for loadout."""
+
+    def __init__(self, inventory, loadout):
+        self.inventory = inventory
+        self.loadout = loadout
+
+    def __len__(self):
+        return len(self.inventory) + len(self.loadout)
+
+
+def _parse_slot(key, names=None):
+    if isinstance(key, str) and names:
+        for i, name in enumerate(names):
+            if key.lower() == name.lower():
+                return i
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        raise SaveEditError(f"Bad slot '{key}' in kit.") from None
+
+
+def parse_kit(spec):
+    """Resolve and rule-check a kit dict. Raises SaveEditError on the first bad entry."""
+    if not isinstance(spec, dict):
+        raise SaveEditError("A kit must be a JSON object with 'inventory' and/or 'loadout'.")
+
+    inventory = []
+    for key, value in (spec.get("inventory") or {}).items():
+        slot_index = _parse_slot(key)
+        item, count = (value.get("item"), value.get("count", 1)) if isinstance(value, dict) else (value, 1)
+        record = resolve_item(item, fuzzy=False)
+        if not 0 <= slot_index < INVENTORY_SLOT_COUNT:
+            raise SaveEditError(f"Slot {slot_index} is outside the inventory (0-{INVENTORY_SLOT_COUNT - 1}).")
+        check_inventory_slot(record.category, slot_index)
+        inventory.append((slot_index, record.persistence_id, clamp_count(record, int(count))))
+
+    loadout = []
+    for key, value in (spec.get("loadout") or {}).items():
+        loadout_index = _parse_slot(key, LOADOUT_SLOT_NAMES)
+        record = resolve_item(value.get("item") if isinstance(value, dict) else value, fuzzy=False)
+        check_loadout_slot(record, loadout_index)
+        loadout.append((loadout_index, record.persistence_id))
+
+    if not inventory and not loadout:
+        raise SaveEditError("The kit is empty.")
+    return Kit(inventory, loadout)
+
+
+def load_kit(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_kit(json.load(f))
+
+
+def find_saves(target):
+    """Character saves in a directory, or matching a glob pattern. Backups are skipped."""
+    if os.path.isdir(target):
+        paths = glob.glob(os.path.join(target, "*.json"))
+    else:
+        paths = glob.glob(target)
+    return sorted(p for p in paths if os.path.isfile(p) and not p.endswith("_backup.json"))
+
+
+def apply_kit(doc, kit):
+    """Apply ``kit`` to a loaded SaveDocument in memory."""
+    for slot_index, item_id, count in kit.inventory:
+        doc.add_item(slot_index, item_id, count)
+    for loadout_index, item_id in kit.loadout:
+        doc.equip_item(loadout_index, item_id)
+
+
+def apply_kit_to_file(path, kit):
+    """Load, apply and save one file. Returns (path, error message or None).
+
+    A file that is not a save (not JSON, not an object, or an Inventory or
+    Loadout that is not an object) fails to load with SaveFormatError, a
+    ValueError, so it is reported as that file's error and left untouched.
+    """
+    try:
+        doc = SaveDocument.load(path)
+        apply_kit(doc, kit)
+        doc.save()
+    except (SaveEditError, OSError, ValueError) as e:
+        return path, str(e)
+    return path, None
+
+
+def _init_worker():
+    load_item_list()
+
+
+def map_saves(func, paths, workers=None, **kwargs):
+    """``func(path, **kwargs)`` for every file in ``paths``, in worker processes. Yields results in order.
+
+    ``func`` must be a module-level function so it can be sent to the
+    workers, each of which loads the item list once before its first call.
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield func(path, **kwargs)
+        return
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(partial(func, **kwargs), paths, chunksize=chunksize)
+
+
+def apply_kit_to_saves(paths, kit, workers=None):
+    """Apply ``kit`` to every file in ``paths``, in parallel. Yields (path, error or None) in order."""
+    return map_saves(apply_kit_to_file, paths, workers, kit=kit)
@@ -0,0 +1,73 @@
+"""Load and save a synthetic multi-megabyte character save, eagerly and lazily.
+
+    python benchmarks/bench_save_load.py [--size-mb 8] [--repeat 5]
+
+Reports wall time and the memory still held by the loaded document
+(tracemalloc) for a full ``json.loads`` versus the lazy partial parse, and
+the time to write back a single-slot edit.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from save_core import SaveDocument  # noqa: E402
+from synthetic import synthetic_save  # noqa: E402
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def _retained(fn):
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (1024 * 1024)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    payload = synthetic_save(args.size_mb)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        with open(path, "wb") as f:
+            f.write(payload)
+        print(f"Synthetic save: {len(payload) / (1024 * 1024):.1f} MB")
+
+        for label, lazy in (("full parse", False), ("lazy parse", True)):
+            load_ms = _time(lambda: SaveDocument.load(path, lazy=lazy), args.repeat)
+            held_mb = _retained(lambda: SaveDocument.load(path, lazy=lazy))
+            doc = SaveDocument.load(path, lazy=lazy)
+
+            def edit_and_save():
+                doc.clear_slot(0) or doc.data["Inventory"].setdefault("0", {"ItemData": "x", "Count": 1})
+                doc.mark_changed("Inventory")
+                doc.save()
+            save_ms = _time(edit_and_save, args.repeat)
+            print(f"{label:>11}: load {load_ms:8.1f} ms   held {held_mb:7.1f} MB   one-slot save {save_ms:7.1f} ms")
+
+        full_dump_ms = _time(lambda: json.dumps(json.loads(payload), indent=4), args.repeat)
+        print(f"{'json.dumps':>11}: full re-encode of the same save {full_dump_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
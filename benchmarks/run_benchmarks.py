@@ -0,0 +1,262 @@
+"""Benchmark suite for the editor's hot paths.
+
+    python benchmarks/run_benchmarks.py [--scales 1 10] [--save-mb 8] [--repeat 5]
+                                        [--no-gui] [--out FILE] [--compare BASELINE.json]
+
+Core benchmarks (catalog, search, save load/save, undo) run anywhere. GUI
+benchmarks build a real SaveEditor window; without a display they start
+Xvfb if it is installed, and are skipped otherwise. Results are written as
+JSON (by default to benchmarks/results/<commit>-<time>.json) so runs can be
+diffed across commits with --compare.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+import save_core  # noqa: E402
+from synthetic import synthetic_save, write_synthetic_catalog  # noqa: E402
+
+
+def measure(fn, repeat, setup=None):
+    """Median/min wall time of ``fn`` in ms; ``setup`` runs untimed before each call."""
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc.collect()
+        t0 = time.perf_counter()
+        fn(state) if setup else fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": round(statistics.median(samples), 4), "min_ms": round(min(samples), 4),
+            "repeat": repeat}
+
+
+def use_catalog(item_path, compiled_path):
+    """Point save_core at a (synthetic) ItemID.txt and load it."""
+    save_core.ITEM_LIST_PATH = item_path
+    save_core.CATALOG_PATH = compiled_path
+    return save_core.load_item_list()
+
+
+def core_benchmarks(args, tmp, results):
+    from catalog import compile_catalog
+    from item_search import ItemSearchIndex
+
+    real_item_path, real_catalog_path = save_core.ITEM_LIST_PATH, save_core.CATALOG_PATH
+    for scale in args.scales:
+        item_path = real_item_path if scale == 1 else write_synthetic_catalog(tmp, scale)
+        compiled = os.path.join(tmp, f"catalog_x{scale}.bin")
+        tag = f"x{scale}"
+
+        results[f"catalog.compile.{tag}"] = measure(lambda: compile_catalog(item_path, compiled), args.repeat)
+        results[f"load_item_list.{tag}"] = measure(lambda: use_catalog(item_path, compiled), args.repeat)
+        catalog = save_core.CATALOG
+        results[f"load_item_list.{tag}"]["items"] = len(catalog)
+
+        results[f"search.build_index.{tag}"] = measure(lambda: ItemSearchIndex(catalog.records), args.repeat)
+        index = save_core.search_index()
+        typed = ["i", "ir", "iro", "iron", "iron s", "iron sw", "iron swo"]
+
+        def typing():
+            # Each keystroke of a fresh search, with nothing cached from the previous run
+            index._query_cache.clear()
+            for text in typed:
+                index.search(text)
+        results[f"search.typing.{tag}"] = measure(typing, args.repeat)
+        results[f"search.fuzzy.{tag}"] = measure(lambda: index.search("irn swrod"), args.repeat)
+    use_catalog(real_item_path, real_catalog_path)
+
+    item_ids = [r.persistence_id for r in save_core.CATALOG.records if r.persistence_id]
+    save_path = os.path.join(tmp, "bench_save.json")
+    payload = synthetic_save(args.save_mb, item_ids)
+    results["save.size_mb"] = {"value": round(len(payload) / (1024 * 1024), 2)}
+
+    def fresh_file():
+        # The backup store is left in place: it already holds this content, as it would after a first save
+        with open(save_path, "wb") as f:
+            f.write(payload)
+
+    fresh_file()
+    results["save.load_lazy"] = measure(lambda: save_core.SaveDocument.load(save_path), args.repeat)
+    results["save.load_full"] = measure(lambda: save_core.SaveDocument.load(save_path, lazy=False), args.repeat)
+
+    name = save_core.CATALOG.records[0].name
+
+    def loaded_doc():
+        fresh_file()
+        doc = save_core.SaveDocument.load(save_path)
+        doc.add_item(8, name, 1)
+        return doc
+    results["save.save_one_slot"] = measure(lambda doc: doc.save(), args.repeat, setup=loaded_doc)
+
+    def filled_doc():
+        doc = save_core.SaveDocument.load(save_path)
+        doc.fill_slots(8, 31, name, 1)
+        return doc
+    results["save.undo_fill_24"] = measure(lambda doc: doc.undo(), args.repeat, setup=filled_doc)
+    return save_path, fresh_file
+
+
+def gui_benchmarks(args, save_path, fresh_file, results):
+    import tkinter as tk
+    import editor_gui
+
+    root = tk.Tk()
+    try:
+        t0 = time.perf_counter()
+        app = editor_gui.SaveEditor(root)
+        root.update()
+        results["gui.startup"] = {"median_ms": round((time.perf_counter() - t0) * 1000, 4), "repeat": 1}
+        deadline = time.perf_counter() + 30
+        while ("item_box_ready_ms" not in app.startup_report or not app._warmup_done.is_set()) \
+                and time.perf_counter() < deadline:
+            root.update()
+        # Phases are measured from the editor_gui import, so they include Tk and PIL start-up
+        for phase, ms in app.startup_report.items():
+            results[f"gui.startup.{phase[:-3]}"] = {"median_ms": ms, "repeat": 1}
+
+        ids = [r.persistence_id for r in save_core.CATALOG.records if r.persistence_id][:200]
+
+        def icons():
+            for item_id in ids:
+                editor_gui.get_icon_image(item_id, editor_gui.SLOT_SIZE - 8)
+        results["gui.get_icon_image.cold_200"] = measure(lambda _: icons(), args.repeat,
+                                                         setup=editor_gui.ICON_CACHE.clear)
+        results["gui.get_icon_image.warm_200"] = measure(icons, args.repeat)
+
+        for label, query in (("all", ("", "All")), ("text", ("iron", "All")), ("tier", ("", "3"))):
+            def populate(q=query):
+                app._populate_item_box(*q)
+                root.update_idletasks()
+            results[f"gui.populate_item_box.{label}"] = measure(populate, args.repeat)
+
+        fresh_file()
+        results["gui.load_json"] = measure(lambda: app._open_save(save_path), args.repeat)
+
+        def full_repaint():
+            app._rendered_slots.clear()
+            app._refresh_inventory()
+            root.update_idletasks()
+        results["gui.refresh_inventory.full"] = measure(full_repaint, args.repeat)
+        name = save_core.CATALOG.records[0].name
+
+        def one_slot():
+            app.document.clear_slot(9) or app.document.add_item(9, name, 1)
+            app._refresh_inventory()
+            root.update_idletasks()
+        results["gui.refresh_inventory.one_slot"] = measure(one_slot, args.repeat)
+        results["gui.refresh_inventory.one_slot"]["widgets_touched"] = app.last_refresh_touched
+
+        def edited(_=None):
+            app.document.clear_slot(10) or app.document.add_item(10, name, 1)
+        results["gui.save_file"] = measure(lambda _: app._save_file(), args.repeat, setup=edited)
+    finally:
+        root.destroy()
+
+
+def start_xvfb():
+    """Start a private Xvfb display if there is none. Returns the process, or None."""
+    if os.environ.get("DISPLAY") or os.name == "nt" or sys.platform == "darwin":
+        return None
+    if not shutil.which("Xvfb"):
+        return None
+    display = ":%d" % (90 + os.getpid() % 100)
+    proc = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return proc
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(baseline_path, results):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'benchmark':<40}{'baseline':>12}{'now':>12}{'change':>10}")
+    for name, now in results.items():
+        before = baseline.get(name, {}).get("median_ms")
+        if before is None or "median_ms" not in now:
+            continue
+        change = (now["median_ms"] - before) / before * 100 if before else 0.0
+        print(f"{name:<40}{before:>10.2f}ms{now['median_ms']:>10.2f}ms{change:>+9.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the editor benchmarks and store the results as JSON.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="catalog sizes, in multiples of ItemID.txt")
+    parser.add_argument("--save-mb", type=int, default=8, help="size of the synthetic save")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true", help="skip the benchmarks that need a display")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    skipped = {}
+    xvfb = None
+    with tempfile.TemporaryDirectory() as tmp:
+        save_path, fresh_file = core_benchmarks(args, tmp, results)
+        if args.no_gui:
+            skipped["gui"] = "--no-gui"
+        else:
+            xvfb = start_xvfb()
+            try:
+                gui_benchmarks(args, save_path, fresh_file, results)
+            except Exception as e:
+                skipped["gui"] = f"{type(e).__name__}: {e}"
+            finally:
+                if xvfb is not None:
+                    xvfb.terminate()
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": args.scales,
+            "repeat": args.repeat,
+            "xvfb": xvfb is not None,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+    out = args.out or os.path.join(HERE, "results", f"{commit or 'nocommit'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, stats in results.items():
+        value = f"{stats['median_ms']:.2f} ms" if "median_ms" in stats else stats.get("value")
+        print(f"{name:<40}{value}")
+    for group, reason in skipped.items():
+        print(f"skipped {group}: {reason}")
+    print(f"Results written to {out}")
+    if args.compare:
+        compare(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
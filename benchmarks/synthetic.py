@@ -0,0 +1,69 @@
+"""Synthetic inputs for the benchmarks.
+
+Catalogs are the real ItemID.txt repeated ``scale`` times with renamed
+items and fresh PersistenceIDs, so search and layout see realistic names and
+every copy still points at a real icon. Saves carry a full 80-slot
+inventory plus a bulky section the editor never reads.
+"""
+import base64
+import hashlib
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from save_core import ITEM_LIST_PATH, generate_guid  # noqa: E402
+
+
+def _derived_id(persistence_id, copy):
+    digest = hashlib.sha1(f"{persistence_id}:{copy}".encode("utf-8")).digest()[:16]
+    return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+def synthetic_catalog_entries(scale=1):
+    with open(ITEM_LIST_PATH, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    entries = list(base)
+    for copy in range(1, scale):
+        for entry in base:
+            clone = dict(entry)
+            if clone.get("SourceString"):
+                clone["SourceString"] = f"{clone['SourceString'].strip()} Mk{copy + 1}"
+            if clone.get("PersistenceID"):
+                clone["PersistenceID"] = _derived_id(clone["PersistenceID"], copy)
+            entries.append(clone)
+    return entries
+
+
+def write_synthetic_catalog(directory, scale=1):
+    """Write an ItemID.txt ``scale`` times the size of the real one. Returns its path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"ItemID_x{scale}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(synthetic_catalog_entries(scale), f, indent=4)
+    return path
+
+
+def synthetic_save(size_mb, item_ids=None, seed=1):
+    """A save shaped like the game's: a full inventory, a loadout and ``size_mb`` of other data."""
+    rng = random.Random(seed)
+    item_ids = item_ids or [f"item{i:04d}" for i in range(900)]
+    inventory = {"MaxSlotIndex": 79}
+    for slot in range(80):
+        inventory[str(slot)] = {"GUID": generate_guid(), "ItemData": rng.choice(item_ids),
+                                "Count": rng.randrange(1, 100), "VitalShield": 0}
+    loadout = {str(i): {"GUID": generate_guid(), "ItemData": rng.choice(item_ids)} for i in range(5)}
+    data = {"Name": "Benchmark", "Inventory": inventory, "Loadout": loadout, "WorldState": [], "Stats": {}}
+    target = size_mb * 1024 * 1024
+    size = 0
+    i = 0
+    while size < target:
+        chunk = {"Id": generate_guid(), "Position": [rng.random() * 1e4 for _ in range(3)],
+                 "Flags": [rng.random() < 0.5 for _ in range(8)], "Tag": f"actor_{i}"}
+        data["WorldState"].append(chunk)
+        data["Stats"][f"stat_{i}"] = rng.randrange(1 << 30)
+        size += 500  # roughly what one actor and one stat take once indented
+        i += 1
+    return json.dumps(data, indent=4).encode("utf-8")
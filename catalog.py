@@ -0,0 +1,162 @@
+"""Compiled item catalog.
+
+ItemID.txt is parsed once and stored as marshalled column arrays next to the
+other caches; later launches load the columns directly and rebuild compact
+``ItemRecord`` objects with interned strings. The compiled file is keyed on
+the source's size and mtime, so editing ItemID.txt recompiles it.
+"""
+import json
+import marshal
+import os
+import sys
+import tempfile
+
+CATALOG_FORMAT = 1
+CATALOG_FILENAME = "catalog.bin"
+
+# ItemID.txt key -> ItemRecord attribute, in column order
+FIELDS = (
+    ("SourceString", "name"),
+    ("PersistenceID", "persistence_id"),
+    ("Weight", "weight"),
+    ("MaxStackSize", "max_stack_size"),
+    ("VitalShield", "vital_shield"),
+    ("IconFile", "icon_file"),
+    ("Category", "category"),
+    ("PowerLevel", "power_level"),
+    ("BaseDurability", "base_durability"),
+)
+_ATTR_FOR_KEY = dict(FIELDS)
+_INTERNED = ("name", "persistence_id", "icon_file", "category")
+
+
+class ItemRecord:
+    __slots__ = tuple(attr for _, attr in FIELDS)
+
+    def __init__(self, name, persistence_id, weight, max_stack_size, vital_shield,
+                 icon_file, category, power_level, base_durability):
+        self.name = name
+        self.persistence_id = persistence_id
+        self.weight = weight
+        self.max_stack_size = max_stack_size
+        self.vital_shield = vital_shield
+        self.icon_file = icon_file
+        self.category = category
+        self.power_level = power_level
+        self.base_durability = base_durability
+
+    def get(self, key, default=None):
+        """Read a field by its ItemID.txt key, like the raw entry dicts."""
+        attr = _ATTR_FOR_KEY.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __repr__(self):
+        return f"ItemRecord({self.name!r}, {self.persistence_id!r})"
+
+    def fields(self):
+        return tuple(getattr(self, attr) for attr in self.__slots__)
+
+
+class Catalog:
+    def __init__(self, records):
+        self.records = records
+        self.by_name = {}
+        self.by_id = {}
+        self.categories = {}
+        for record in records:
+            if record.persistence_id:
+                self.by_id[record.persistence_id] = record
+            if not record.name:
+                continue
+            self.by_name[record.name] = record
+            self.categories.setdefault(sys.intern(record.category.lower()), []).append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def by_persistence_id(self, persistence_id):
+        return self.by_id.get(persistence_id)
+
+    def columns(self):
+        return [[getattr(r, attr) for r in self.records] for _, attr in FIELDS]
+
+    @classmethod
+    def from_columns(cls, columns):
+        for i, (_, attr) in enumerate(FIELDS):
+            if attr in _INTERNED:
+                columns[i] = [sys.intern(v) for v in columns[i]]
+        return cls([ItemRecord(*row) for row in zip(*columns)])
+
+    @classmethod
+    def from_entries(cls, entries):
+        columns = [[] for _ in FIELDS]
+        for entry in entries:
+            for i, (key, attr) in enumerate(FIELDS):
+                value = entry.get(key)
+                if attr in _INTERNED:
+                    value = (value or "").strip() if attr == "name" else (value or "")
+                columns[i].append(value)
+        return cls.from_columns(columns)
+
+
+def _source_fingerprint(item_path):
+    st = os.stat(item_path)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def compile_catalog(item_path, compiled_path):
+    """Parse ItemID.txt and write the compiled columns. Returns the Catalog."""
+    fingerprint = _source_fingerprint(item_path)
+    with open(item_path, "r", encoding="utf-8") as f:
+        catalog = Catalog.from_entries(json.load(f))
+    try:
+        directory = os.path.dirname(compiled_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # A private temp file, so two processes compiling at once cannot clobber each other's
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(compiled_path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump((CATALOG_FORMAT, fingerprint, catalog.columns()), f)
+            os.replace(tmp_path, compiled_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        print(f"Could not write compiled catalog: {e}")
+    return catalog
+
+
+def load_catalog(item_path, compiled_path):
+    """Load the compiled catalog, recompiling it if ItemID.txt has changed."""
+    fingerprint = _source_fingerprint(item_path)
+    try:
+        with open(compiled_path, "rb") as f:
+            fmt, cached_fingerprint, columns = marshal.loads(f.read())
+        if fmt == CATALOG_FORMAT and tuple(cached_fingerprint) == fingerprint:
+            return Catalog.from_columns(columns)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return compile_catalog(item_path, compiled_path)
+
+
+if __name__ == "__main__":
+    import save_core
+
+    out = sys.argv[1] if len(sys.argv) > 1 else save_core.CATALOG_PATH
+    catalog = compile_catalog(save_core.ITEM_LIST_PATH, out)
+    print(f"Compiled {len(catalog)} items into {out}")
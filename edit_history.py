@@ -0,0 +1,96 @@
+"""Undo/redo for save edits.
+
+Each step stores only the slots it touched, as (section, key, old, new)
+tuples. Slot entries are never mutated in place, so old and new values are
+shared with the document instead of copied: undoing a fill of 24 slots
+costs 24 reference swaps, whatever the size of the save. The history is
+bounded both by step count and by an estimate of the memory it pins.
+"""
+import os
+
+DEFAULT_DEPTH = int(os.environ.get("RSD_UNDO_DEPTH", "200"))
+DEFAULT_BUDGET_BYTES = int(float(os.environ.get("RSD_UNDO_MB", "16")) * 1024 * 1024)
+
+# Marks a key that did not exist before (or after) a change
+MISSING = object()
+
+
+def _cost(value):
+    """Rough bytes a history entry keeps alive; slot entries are small flat dicts."""
+    if value is MISSING or value is None:
+        return 0
+    if isinstance(value, dict):
+        return 232 + sum(64 + len(str(v)) for v in value.values())
+    return 64
+
+
+class EditStep:
+    __slots__ = ("label", "changes", "cost")
+
+    def __init__(self, label, changes):
+        self.label = label
+        self.changes = changes
+        self.cost = 120 + sum(88 + _cost(old) + _cost(new) for _, _, old, new in changes)
+
+    def sections(self):
+        return {section for section, _, _, _ in self.changes}
+
+
+class EditHistory:
+    def __init__(self, depth=DEFAULT_DEPTH, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.depth = depth
+        self.budget_bytes = budget_bytes
+        self._undo = []
+        self._redo = []
+        self.bytes_used = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def push(self, label, changes):
+        """Record a new step; this clears the redo stack."""
+        step = EditStep(label, changes)
+        self._undo.append(step)
+        self.bytes_used += step.cost
+        for dropped in self._redo:
+            self.bytes_used -= dropped.cost
+        self._redo.clear()
+        self._trim()
+        return step
+
+    def _trim(self):
+        # Oldest steps go first; the newest one is always kept
+        drop = 0
+        while len(self._undo) - drop > 1 and (
+                len(self._undo) - drop > self.depth or self.bytes_used > self.budget_bytes):
+            self.bytes_used -= self._undo[drop].cost
+            drop += 1
+        if drop:
+            del self._undo[:drop]
+
+    def pop_undo(self):
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step
+
+    def pop_redo(self):
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes_used = 0
@@ -0,0 +1,1601 @@
+"""Tk front end for the save editor. Imported only when the GUI starts."""
+import time
+# Startup is timed from here, so the report includes importing Tk, PIL and the editor modules
+STARTUP_T0 = time.perf_counter()
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from tkinter import ttk
+import os
+import webbrowser
+from PIL import Image, ImageTk
+import bisect
+import itertools
+import queue
+import threading
+from icon_atlas import ATLAS_FILENAME, PLACEHOLDER_ICON_FILE, load_atlas
+from thumb_cache import ThumbnailCache
+from save_index import SaveIndex
+import instrument
+from instrument import timed
+import save_core
+from save_core import (
+    ASSETS_DIR, UI_DIR, ITEM_LIST_PATH, CACHE_DIR, DEFAULT_SAVE_DIR,
+    ICON_MAP, POWER_MAP, ITEM_NAME_MAP, SaveConflictError, SaveDocument, SaveEditError, clamp_count,
+    item_list_changed, load_item_list, search_index,
+)
+
+class ToolTip:
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        self.tipwindow = None
+        widget.bind("<Enter>", self.show_tip)
+        widget.bind("<Leave>", self.hide_tip)
+
+    def show_tip(self, event=None):
+        if self.tipwindow or not self.text:
+            return
+        x = self.widget.winfo_rootx() + 20
+        y = self.widget.winfo_rooty() + self.widget.winfo_height() + 2
+        self.tipwindow = tw = tk.Toplevel(self.widget)
+        tw.wm_overrideredirect(True)
+        tw.wm_geometry(f"+{x}+{y}")
+        label = tk.Label(tw, text=self.text, background="#ffffe0", relief="solid", borderwidth=1, font=("Georgia", 9))
+        label.pack()
+
+    def hide_tip(self, event=None):
+        tw = self.tipwindow
+        if tw:
+            tw.destroy()
+            self.tipwindow = None
+
+class CanvasToolTip(ToolTip):
+    """A single tooltip shared by everything drawn on a canvas; the text follows the pointer."""
+    def __init__(self, canvas):
+        self.widget = canvas
+        self.text = None
+        self.tipwindow = None
+
+    def show_text(self, text, x_root, y_root):
+        if text == self.text and self.tipwindow:
+            return
+        self.hide_tip()
+        self.text = text
+        if not text:
+            return
+        self.tipwindow = tw = tk.Toplevel(self.widget)
+        tw.wm_overrideredirect(True)
+        tw.wm_geometry(f"+{x_root + 20}+{y_root + 20}")
+        label = tk.Label(tw, text=text, background="#ffffe0", relief="solid", borderwidth=1, font=("Georgia", 9))
+        label.pack()
+
+ATLAS_PATH = os.path.join(CACHE_DIR, ATLAS_FILENAME)
+THUMB_CACHE_DIR = os.path.join(CACHE_DIR, "thumbs")
+THUMB_CACHE_MAX_MB = int(os.environ.get("RSD_THUMB_CACHE_MB", "64"))
+
+SLOT_SIZE = 64
+ITEM_ICON_SIZE = 32
+SELECTED_ICON_SIZE = int(ITEM_ICON_SIZE * 1.2)
+ITEM_BOX_COLUMNS = 10
+ITEM_BOX_CELL = ITEM_ICON_SIZE + 8
+ITEM_BOX_HEADER_HEIGHT = 27
+ITEM_BOX_CATEGORY_GAP = 4
+# Categories laid out per idle tick while the item box first fills in
+ITEM_BOX_STARTUP_CHUNK = 4
+SEARCH_DEBOUNCE_MS = 150
+# Edits are written once the editor has been idle this long (or on Save Now / exit)
+SAVE_DEBOUNCE_MS = 1500
+# How often the loaded save is checked for changes made by the game or other tools
+DISK_POLL_MS = 1000
+# How often the Find in Saves panel checks whether its background rescan finished
+INDEX_POLL_MS = 100
+# Every size get_icon_image is asked for; these are prebuilt into the atlas
+ATLAS_SIZES = (ITEM_ICON_SIZE, SELECTED_ICON_SIZE, SLOT_SIZE - 8, 46)
+
+POWER_BADGES = {}
+ICON_CACHE = {}
+ICON_ATLAS = None
+THUMB_CACHE = ThumbnailCache(THUMB_CACHE_DIR, THUMB_CACHE_MAX_MB * 1024 * 1024)
+PLACEHOLDER_ICON = None
+PLACEHOLDER_ICON_SELECTED = None
+
+selected_slot_index = None
+selected_item_name = None
+current_file_path = None
+current_save_data = None
+
+def load_icon_atlas():
+    global ICON_ATLAS
+    if ICON_ATLAS is None:
+        ICON_ATLAS = load_atlas(ATLAS_PATH, ITEM_LIST_PATH, UI_DIR, ATLAS_SIZES)
+    return ICON_ATLAS
+
+def load_icon_pixels(icon_name: str, size: int) -> bytes | memoryview | None:
+    """RGBA pixels for an icon: atlas first, then the thumbnail cache, then the PNG itself."""
+    if ICON_ATLAS is not None:
+        pixels = ICON_ATLAS.get(icon_name, size)
+        if pixels is not None:
+            THUMB_CACHE.record_atlas_hit()
+            return pixels
+
+    p = os.path.join(UI_DIR, icon_name)
+    if not os.path.exists(p):
+        return None
+    pixels = THUMB_CACHE.get(p, icon_name, size)
+    if pixels is None:
+        pixels = Image.open(p).convert("RGBA").resize((size, size), Image.LANCZOS).tobytes()
+        THUMB_CACHE.put(p, icon_name, size, pixels)
+    return pixels
+
+def pixels_to_photo(pixels, size: int) -> ImageTk.PhotoImage:
+    return ImageTk.PhotoImage(Image.frombuffer("RGBA", (size, size), pixels, "raw", "RGBA", 0, 1))
+
+@timed("get_icon_image", quiet=True, tags=lambda item_id, size=SLOT_SIZE: {"hit": (item_id, size) in ICON_CACHE})
+def get_icon_image(item_id: str, size: int = SLOT_SIZE) -> ImageTk.PhotoImage | None:
+    if not item_id:
+        return None
+
+    cache_key = (item_id, size)
+    if cache_key in ICON_CACHE:
+        return ICON_CACHE[cache_key]
+
+    icon_name = ICON_MAP.get(item_id)
+    if not icon_name:
+        return None
+
+    try:
+        pixels = load_icon_pixels(icon_name, size)
+        if pixels is None:
+            return None
+        tk_img = pixels_to_photo(pixels, size)
+        ICON_CACHE[cache_key] = tk_img
+        return tk_img
+    except Exception as e:
+        print(f"Failed to load icon {icon_name}: {e}")
+        return None
+
+class IconLoader:
+    """Decodes icons on worker threads and swaps them in from the Tk thread.
+
+    Workers only produce RGBA buffers; PhotoImage creation and the callbacks
+    run on the Tk thread, drained in small batches via root.after. Lower
+    priority values are decoded first.
+    """
+    DRAIN_INTERVAL_MS = 15
+    DRAIN_BATCH = 48
+
+    def __init__(self, root, workers=None):
+        self.root = root
+        self._jobs = queue.PriorityQueue()
+        self._results = queue.SimpleQueue()
+        self._seq = itertools.count()
+        self._waiters = {}
+        self._priority = {}
+        self._drain_scheduled = False
+        for i in range(workers or min(4, os.cpu_count() or 1)):
+            threading.Thread(target=self._work, name=f"icon-loader-{i}", daemon=True).start()
+
+    def request(self, item_id, size, callback, priority=0):
+        """Call ``callback(photo)`` on the Tk thread once the icon is ready."""
+        cache_key = (item_id, size)
+        if cache_key in ICON_CACHE:
+            callback(ICON_CACHE[cache_key])
+            return
+        icon_name = ICON_MAP.get(item_id)
+        if not icon_name:
+            return
+        waiters = self._waiters.get(cache_key)
+        if waiters is not None:
+            waiters.append(callback)
+            if priority >= self._priority.get(cache_key, priority):
+                return
+        else:
+            self._waiters[cache_key] = [callback]
+        # Re-queueing at a better priority supersedes the older job, which workers then skip
+        self._priority[cache_key] = priority
+        self._jobs.put((priority, next(self._seq), cache_key, icon_name))
+        self._schedule_drain()
+
+    def cancel_callbacks(self):
+        """Forget callbacks for widgets about to be destroyed; queued decodes still fill ICON_CACHE."""
+        for waiters in self._waiters.values():
+            waiters.clear()
+
+    def _work(self):
+        while True:
+            priority, _, cache_key, icon_name = self._jobs.get()
+            if self._priority.get(cache_key) != priority:
+                continue
+            try:
+                pixels = load_icon_pixels(icon_name, cache_key[1])
+            except Exception as e:
+                print(f"Failed to load icon {icon_name}: {e}")
+                pixels = None
+            self._results.put((cache_key, pixels))
+
+    def _schedule_drain(self):
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root.after(self.DRAIN_INTERVAL_MS, self._drain)
+
+    def _drain(self):
+        self._drain_scheduled = False
+        for _ in range(self.DRAIN_BATCH):
+            try:
+                cache_key, pixels = self._results.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self._waiters.pop(cache_key, [])
+            self._priority.pop(cache_key, None)
+            if pixels is None:
+                continue
+            tk_img = pixels_to_photo(pixels, cache_key[1])
+            ICON_CACHE[cache_key] = tk_img
+            for callback in callbacks:
+                callback(tk_img)
+        if self._waiters:
+            self._schedule_drain()
+
+class SaveEditor:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("RuneScape Dragonwilds Save Editor")
+        self.root.geometry("1100x700")
+        self.root.configure(bg="#1c1b18")
+        self.root.minsize(900, 600)
+        
+        self.selected_slot_index = None
+        self.selected_loadout_index = None
+        self.selected_item_name = None
+        self.document = None
+        self.current_file_path = None
+        self.current_save_data = None
+        self.slot_labels = {}
+        self.loadout_labels = []
+        # Last (ItemData, Count, power level) drawn per slot; loadout slots are keyed ("loadout", i)
+        self._rendered_slots = {}
+        self.last_refresh_touched = 0
+        self.inventory_icons = {}
+        self.current_tab = "main"
+        self._save_after = None
+        self.save_index = None
+        self._index_panel = None
+        # (SaveIndex, thread) of the rescan running in the background, if any
+        self._index_refresh = None
+        self.startup_report = {"imports_ms": self._startup_ms()}
+        self._warmup_done = threading.Event()
+        
+        self.catalog = self._load_catalog()
+        self.item_lookup = self.catalog.by_name
+        self.categorized_items = self.catalog.categories
+        self.startup_report["catalog_ms"] = self._startup_ms()
+        self.icon_loader = IconLoader(self.root)
+        
+        self._init_placeholder_icons()
+        self._init_power_badges()
+        self._setup_styles()
+        self._create_layout()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.bind("<Control-z>", lambda e: self._undo())
+        self.root.bind("<Control-y>", lambda e: self._redo())
+        self.root.bind("<Control-Z>", lambda e: self._redo())
+        # Set while a disk conflict is being shown or was left for later, so polling stops re-asking
+        self._conflict_pending = False
+        # Set only while the conflict dialog is open; timers still fire under a modal dialog
+        self._conflict_dialog_open = False
+        self.root.after(DISK_POLL_MS, self._poll_disk)
+        
+        if instrument.enabled():
+            instrument.register_gauge("tk_widgets", lambda: instrument.count_widgets(self.root))
+            instrument.register_gauge("icon_cache", lambda: len(ICON_CACHE))
+            if instrument.overlay_requested:
+                self._stats_overlay = tk.Label(self.root, justify="left", anchor="nw", fg="#9f9", bg="#111",
+                                               font=("Consolas", 8))
+                self._stats_overlay.place(relx=1.0, rely=1.0, anchor="se")
+                self._update_stats_overlay()
+        
+        # The window is usable once this first idle callback runs; the item box fills in after it
+        self.startup_report["layout_ms"] = self._startup_ms()
+        self.root.after_idle(self._on_first_idle)
+        
+    def _startup_ms(self):
+        return round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+    
+    def _on_first_idle(self):
+        self.startup_report["first_interactive_ms"] = self._startup_ms()
+        threading.Thread(target=self._warm_up, name="startup-warmup", daemon=True).start()
+        self._populate_item_box(chunked=True)
+    
+    def _warm_up(self):
+        """Load the icon atlas and build the search index off the Tk thread."""
+        try:
+            load_icon_atlas()
+            self.startup_report["atlas_ready_ms"] = self._startup_ms()
+            search_index()
+            self.startup_report["search_ready_ms"] = self._startup_ms()
+        except Exception as e:
+            print(f"Startup warm-up failed: {e}")
+        finally:
+            self._warmup_done.set()
+    
+    def _report_startup(self):
+        if not self._warmup_done.is_set():
+            self.root.after(100, self._report_startup)
+            return
+        instrument.event("startup", **self.startup_report)
+        if os.environ.get("RSD_STARTUP_REPORT"):
+            print("Startup: " + ", ".join(f"{phase} {ms} ms" for phase, ms in self.startup_report.items()))
+    
+    def _update_stats_overlay(self):
+        rec = instrument.recorder()
+        summary = rec.summary()
+        lines = [f"{name:<20}{ms:7.1f} ms" for name, ms in sorted(rec.last.items())]
+        icons = summary["totals"].get("get_icon_image")
+        if icons:
+            hits = summary["counters"].get("get_icon_image.hit", 0)
+            lines.append(f"icons {icons['calls']} ({hits * 100 // icons['calls']}% hit), {icons['total_ms']:.0f} ms")
+        lines.append(f"widgets {instrument.count_widgets(self.root)}  icon cache {len(ICON_CACHE)}")
+        self._stats_overlay.configure(text="\n".join(lines))
+        self._stats_overlay.lift()
+        self.root.after(500, self._update_stats_overlay)
+    
+    def _load_catalog(self):
+        try:
+            return load_item_list()
+        except FileNotFoundError as e:
+            messagebox.showerror("Missing File", str(e))
+        except ValueError as e:
+            messagebox.showerror("Parse Error", str(e))
+        return save_core.CATALOG
+    
+    def _init_placeholder_icons(self):
+        global PLACEHOLDER_ICON, PLACEHOLDER_ICON_SELECTED
+        try:
+            PLACEHOLDER_ICON = pixels_to_photo(load_icon_pixels(PLACEHOLDER_ICON_FILE, ITEM_ICON_SIZE), ITEM_ICON_SIZE)
+            PLACEHOLDER_ICON_SELECTED = pixels_to_photo(
+                load_icon_pixels(PLACEHOLDER_ICON_FILE, SELECTED_ICON_SIZE), SELECTED_ICON_SIZE
+            )
+        except:
+            placeholder_img = Image.new("RGBA", (ITEM_ICON_SIZE, ITEM_ICON_SIZE), (255, 255, 255, 0))
+            PLACEHOLDER_ICON = ImageTk.PhotoImage(placeholder_img)
+            PLACEHOLDER_ICON_SELECTED = ImageTk.PhotoImage(placeholder_img.resize((SELECTED_ICON_SIZE, SELECTED_ICON_SIZE), Image.LANCZOS))
+    
+    def _init_power_badges(self):
+        global POWER_BADGES
+        if not POWER_BADGES:
+            for lvl in range(1, 6):
+                try:
+                    POWER_BADGES[lvl] = ImageTk.PhotoImage(
+                        Image.open(os.path.join(ASSETS_DIR, f"PowerLevel{lvl}.png")).resize((20, 20))
+                    )
+                except:
+                    pass
+    
+    def _setup_styles(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure("TLabel", background="#1c1b18", foreground="gold", font=("Georgia", 10, "bold"))
+        style.configure("TEntry", fieldbackground="#302f2c", foreground="white")
+        style.configure("TButton", background="#2c2b27", foreground="gold", font=("Georgia", 10, "bold"))
+        style.configure("TFrame", background="#1c1b18")
+    
+    def _create_layout(self):
+        main_container = tk.Frame(self.root, bg="#1c1b18")
+        main_container.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        top_bar = tk.Frame(main_container, bg="#1c1b18")
+        top_bar.pack(fill="x", pady=(0, 10))
+        
+        ttk.Label(top_bar, text="Save File:").pack(side="left")
+        self.entry_file = ttk.Entry(top_bar, width=60)
+        self.entry_file.pack(side="left", padx=5)
+        ttk.Button(top_bar, text="Browse", command=self._load_json).pack(side="left", padx=5)
+        ttk.Button(top_bar, text="Save Now", command=self._save_file).pack(side="left", padx=5)
+        self.btn_undo = ttk.Button(top_bar, text="Undo", command=self._undo, state="disabled")
+        self.btn_undo.pack(side="left", padx=(5, 0))
+        self.btn_redo = ttk.Button(top_bar, text="Redo", command=self._redo, state="disabled")
+        self.btn_redo.pack(side="left", padx=(0, 5))
+        ttk.Button(top_bar, text="Find in Saves", command=self._open_save_index_panel).pack(side="left", padx=5)
+        self.label_save_status = ttk.Label(top_bar, text="", foreground="gray")
+        self.label_save_status.pack(side="left", padx=(10, 0))
+        
+        content_frame = tk.Frame(main_container, bg="#1c1b18")
+        content_frame.pack(fill="both", expand=True)
+        content_frame.columnconfigure(0, weight=1)
+        content_frame.columnconfigure(1, weight=0)
+        content_frame.rowconfigure(0, weight=1)
+        
+        left_panel = tk.Frame(content_frame, bg="#1c1b18")
+        left_panel.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+        left_panel.rowconfigure(1, weight=1)
+        left_panel.columnconfigure(0, weight=1)
+        
+        search_frame = tk.Frame(left_panel, bg="#1c1b18")
+        search_frame.grid(row=0, column=0, sticky="ew", pady=(0, 5))
+        
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_entry = ttk.Entry(search_frame, width=25)
+        self.search_entry.pack(side="left", padx=5)
+        clear_btn = tk.Label(search_frame, text="✖", fg="red", bg="#1c1b18", font=("Arial", 10), cursor="hand2")
+        clear_btn.pack(side="left")
+        clear_btn.bind("<Button-1>", lambda e: self._clear_search())
+        
+        ttk.Label(search_frame, text="Tier:").pack(side="left", padx=(15, 0))
+        self.tier_filter = ttk.Combobox(search_frame, width=8, state="readonly", 
+                                        values=["All", "1", "2", "3", "4", "5"])
+        self.tier_filter.set("All")
+        self.tier_filter.pack(side="left", padx=5)
+        self.tier_filter.bind("<<ComboboxSelected>>", lambda e: self._filter_items())
+        
+        self.item_box_frame = tk.Frame(left_panel, bg="#2c2b27", bd=2, relief="sunken")
+        self.item_box_frame.grid(row=1, column=0, sticky="nsew")
+        self._create_item_box()
+        
+        controls_frame = tk.Frame(left_panel, bg="#1c1b18")
+        controls_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0))
+        
+        ttk.Label(controls_frame, text="Quantity:").grid(row=0, column=0, sticky="e", padx=(0, 5))
+        self.entry_count = ttk.Entry(controls_frame, width=8)
+        self.entry_count.insert(0, "1")
+        self.entry_count.grid(row=0, column=1, sticky="w")
+        self._bind_scroll_increment(self.entry_count)
+        
+        self.label_maxstack = ttk.Label(controls_frame, text="", foreground="gray")
+        self.label_maxstack.grid(row=0, column=2, sticky="w", padx=(10, 0))
+        
+        btn_frame = tk.Frame(controls_frame, bg="#1c1b18")
+        btn_frame.grid(row=0, column=3, sticky="e", padx=(20, 0))
+        
+        ttk.Button(btn_frame, text="Add Item", command=self._add_item).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Clear Slot", command=self._clear_slot).pack(side="left", padx=5)
+        
+        ttk.Label(controls_frame, text="Slots:").grid(row=1, column=0, sticky="e", padx=(0, 5), pady=(8, 0))
+        range_frame = tk.Frame(controls_frame, bg="#1c1b18")
+        range_frame.grid(row=1, column=1, columnspan=2, sticky="w", pady=(8, 0))
+        self.entry_range_start = ttk.Entry(range_frame, width=4)
+        self.entry_range_start.pack(side="left")
+        ttk.Label(range_frame, text="–").pack(side="left", padx=3)
+        self.entry_range_end = ttk.Entry(range_frame, width=4)
+        self.entry_range_end.pack(side="left")
+        ttk.Button(controls_frame, text="Fill Range", command=self._fill_range).grid(
+            row=1, column=3, sticky="w", padx=(25, 0), pady=(8, 0))
+        
+        right_panel = tk.Frame(content_frame, bg="#2c2b27", bd=2, relief="ridge", width=380)
+        right_panel.grid(row=0, column=1, sticky="ns")
+        right_panel.grid_propagate(False)
+        
+        self._create_inventory_panel(right_panel)
+    
+    def _create_inventory_panel(self, parent):
+        parent.configure(width=380, height=580)
+        
+        inv_label = tk.Label(parent, text="Inventory", bg="#2c2b27", fg="gold", font=("Georgia", 12, "bold"))
+        inv_label.pack(pady=(10, 5))
+        
+        action_bar = tk.Frame(parent, bg="#333")
+        action_bar.pack(pady=5)
+        
+        for i in range(8):
+            frame = tk.Frame(action_bar, bg="#444", width=SLOT_SIZE+8, height=SLOT_SIZE+8,
+                           highlightthickness=2, highlightbackground="#222")
+            frame.grid(row=0, column=i, padx=2, pady=2)
+            frame.grid_propagate(False)
+            
+            lbl = tk.Label(frame, text="", bg="#444")
+            lbl.place(relx=0.5, rely=0.5, anchor="center", width=SLOT_SIZE, height=SLOT_SIZE)
+            lbl.slot_index = i
+            lbl.bind("<Button-1>", lambda e, idx=i: self._select_slot(idx))
+            lbl.bind("<Button-3>", lambda e, idx=i: self._show_slot_context_menu(e, idx))
+            self.slot_labels[i] = lbl
+        
+        tab_frame = tk.Frame(parent, bg="#1c1b18")
+        tab_frame.pack(pady=5)
+        
+        try:
+            self.tab_icons = {
+                "main": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Items_Normal.png")).resize((80, 40))),
+                "rune": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Runes_Normal.png")).resize((80, 40))),
+                "quest": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Quests_Normal.png")).resize((80, 40)))
+            }
+            self.tab_icons_selected = {
+                "main": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Items_Highlight.png")).resize((80, 40))),
+                "rune": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Runes_Highlight.png")).resize((80, 40))),
+                "quest": ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Icon_Quests_Highlight.png")).resize((80, 40)))
+            }
+        except Exception as e:
+            print(f"Tab icon loading failed: {e}")
+            self.tab_icons = {}
+            self.tab_icons_selected = {}
+        
+        self.tab_buttons = {}
+        tab_tooltips = {
+            "main": "Main Inventory (Slots 8-31)\nGeneral items, weapons, armor, food, etc.",
+            "rune": "Rune Inventory (Slots 32-55)\nRunes only",
+            "quest": "Quest Inventory (Slots 56-79)\nKey items and quest items only"
+        }
+        for t in ("main", "rune", "quest"):
+            img = self.tab_icons_selected.get(t) if t == self.current_tab else self.tab_icons.get(t)
+            btn = tk.Label(tab_frame, image=img, bg="#1c1b18", cursor="hand2")
+            btn.pack(side="left", padx=5)
+            btn.bind("<Button-1>", lambda e, tab=t: self._switch_tab(tab))
+            ToolTip(btn, tab_tooltips[t])
+            self.tab_buttons[t] = btn
+        
+        self.grid_container = tk.Frame(parent, bg="#222")
+        self.grid_container.pack(pady=5)
+        
+        self.tab_frames = {}
+        tab_start = {"main": 8, "rune": 32, "quest": 56}
+        
+        for name, start in tab_start.items():
+            f = tk.Frame(self.grid_container, bg="#222")
+            f.grid(row=0, column=0, sticky="nsew")
+            self.tab_frames[name] = f
+            
+            for r in range(3):
+                for c in range(8):
+                    idx = start + r * 8 + c
+                    frame = tk.Frame(f, bg="#444", width=SLOT_SIZE+8, height=SLOT_SIZE+8,
+                                   highlightthickness=2, highlightbackground="#222")
+                    frame.grid(row=r, column=c, padx=2, pady=2)
+                    frame.grid_propagate(False)
+                    
+                    lbl = tk.Label(frame, text="", bg="#444")
+                    lbl.place(relx=0.5, rely=0.5, anchor="center", width=SLOT_SIZE, height=SLOT_SIZE)
+                    lbl.slot_index = idx
+                    lbl.bind("<Button-1>", lambda e, i=idx: self._select_slot(i))
+                    lbl.bind("<Button-3>", lambda e, i=idx: self._show_slot_context_menu(e, i))
+                    self.slot_labels[idx] = lbl
+            f.lower()
+        
+        self.tab_frames[self.current_tab].lift()
+        
+        loadout_label = tk.Label(parent, text="Equipment", bg="#2c2b27", fg="gold", font=("Georgia", 10, "bold"))
+        loadout_label.pack(pady=(15, 5))
+        
+        loadout_frame = tk.Frame(parent, bg="#222")
+        loadout_frame.pack(pady=5)
+        
+        try:
+            loadout_icons = [
+                ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Inventory_EquipmentHelmet.png")).resize((40, 40))),
+                ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Inventory_EquipmentBody.png")).resize((40, 40))),
+                ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Inventory_EquipmentLegs.png")).resize((40, 40))),
+                ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Inventory_EquipmentCape.png")).resize((40, 40))),
+                ImageTk.PhotoImage(Image.open(os.path.join(ASSETS_DIR, "T_Inventory_EquipmentTrinket.png")).resize((30, 30)))
+            ]
+            self._loadout_placeholder_icons = loadout_icons
+        except:
+            loadout_icons = [None] * 5
+            self._loadout_placeholder_icons = []
+        
+        for i, icon in enumerate(loadout_icons):
+            frame = tk.Frame(loadout_frame, bg="#444", width=58, height=58,
+                           highlightthickness=2, highlightbackground="#222")
+            frame.grid(row=0, column=i, padx=5, pady=5)
+            frame.grid_propagate(False)
+            
+            lbl = tk.Label(frame, image=icon, bg="#444")
+            lbl.place(relx=0.5, rely=0.5, anchor="center", width=50, height=50)
+            lbl.loadout_index = i
+            lbl.bind("<Button-1>", lambda e, idx=i: self._select_loadout_slot(idx))
+            lbl.bind("<Button-3>", lambda e, idx=i: self._show_loadout_context_menu(e, idx))
+            self.loadout_labels.append(lbl)
+            if icon:
+                lbl.image = icon
+    
+    def _create_item_box(self):
+        canvas = tk.Canvas(self.item_box_frame, bg="#1c1b18", highlightthickness=0)
+        scrollbar = ttk.Scrollbar(self.item_box_frame, orient="vertical", command=canvas.yview)
+        
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            self._render_visible_rows()
+        canvas.configure(yscrollcommand=on_yscroll)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        def on_mousewheel(event):
+            canvas.yview_scroll(-1 * (event.delta // 120), "units")
+        canvas.bind_all("<MouseWheel>", on_mousewheel)
+        
+        # One set of handlers for the whole grid; items are hit-tested from the layout
+        canvas.bind("<Configure>", lambda e: self._render_visible_rows())
+        canvas.bind("<Button-1>", self._on_item_box_click)
+        canvas.bind("<Double-Button-1>", self._on_item_box_double_click)
+        canvas.bind("<Button-3>", self._on_item_box_right_click)
+        canvas.bind("<Motion>", self._on_item_box_motion)
+        canvas.bind("<Leave>", lambda e: self.item_tooltip.hide_tip())
+        
+        self.canvas = canvas
+        self.item_tooltip = CanvasToolTip(canvas)
+        self.category_visible = {}
+        self._grid_rows = []
+        self._grid_row_tops = []
+        self._item_positions = {}
+        self._rendered_rows = {}
+        self._visible_icons = {}
+        self._free_images = []
+        self._free_texts = []
+        self._selection_marker = canvas.create_rectangle(0, 0, 0, 0, outline="gold", width=2, state="hidden")
+        self._search_after = None
+        self._last_filter = ("", "All")
+        # Skip empty/unnamed categories
+        self._categories = [c for c in sorted(self.categorized_items.keys()) if c and c.strip()]
+        self._category_cells = {}
+        self._layout = []
+        self._header_rows = {}
+        self._grid_height = 0
+        self._layout_generation = 0
+        
+        # Filled from the first idle callback, once the rest of the window is up
+        self.search_entry.bind("<KeyRelease>", lambda e: self._schedule_filter())
+    
+    def _cells(self, category):
+        """(name, PersistenceID, original category) for a category, resolved the first time it is expanded."""
+        cells = self._category_cells.get(category)
+        if cells is None:
+            cells = [(r.name, r.persistence_id, r.category) for r in self.categorized_items[category]]
+            self._category_cells[category] = cells
+        return cells
+    
+    @timed("_populate_item_box", tags=lambda self, filter_text="", tier_filter="All", chunked=False: {"query": filter_text, "tier": tier_filter})
+    def _populate_item_box(self, filter_text="", tier_filter="All", chunked=False):
+        """Rebuild the item grid layout. Only rows inside the viewport get canvas items.
+        
+        ``chunked`` lays out a few categories per idle tick instead of all at once.
+        """
+        self.icon_loader.cancel_callbacks()
+        for row_index in list(self._rendered_rows):
+            self._release_row(row_index)
+        
+        # (category, display name, matching cells or None for the whole category)
+        layout = []
+        power_level = None if tier_filter == "All" else int(tier_filter)
+        if filter_text.strip():
+            # Ranked fuzzy search: best-scoring categories first, best items first within them
+            scores = {name: score for score, name in search_index().search(filter_text, power_level)}
+            ranked = []
+            for category in self._categories:
+                records = self.categorized_items[category]
+                hits = sorted(((r.name, r.persistence_id, r.category) for r in records if r.name in scores),
+                              key=lambda cell: -scores[cell[0]])
+                if hits:
+                    ranked.append((-scores[hits[0][0]], category, hits))
+            ranked.sort(key=lambda entry: entry[0])
+            layout = [(category, hits[0][2], hits) for _, category, hits in ranked]
+        elif power_level is not None:
+            matches = search_index().query("", power_level)
+            for category in self._categories:
+                hits = [(r.name, r.persistence_id, r.category) for r in self.categorized_items[category]
+                        if r.name in matches]
+                if hits:
+                    layout.append((category, hits[0][2], hits))
+        else:
+            layout = [(category, self.categorized_items[category][0].category, None)
+                      for category in self._categories if self.categorized_items[category]]
+        
+        self._layout = layout
+        self._grid_rows = []
+        self._grid_row_tops = []
+        self._item_positions = {}
+        self._header_rows = {}
+        self._grid_height = 0
+        self._layout_generation += 1
+        if chunked:
+            self._layout_chunk(0, self._layout_generation)
+        else:
+            self._append_categories(layout)
+            self._show_layout()
+            self._prefetch_icons()
+            self._item_box_ready()
+    
+    def _item_box_ready(self):
+        # A search typed during the startup fill replaces it, so whichever layout completes first counts
+        if "item_box_ready_ms" not in self.startup_report and "first_interactive_ms" in self.startup_report:
+            self.startup_report["item_box_ready_ms"] = self._startup_ms()
+            self._report_startup()
+    
+    def _layout_chunk(self, start, generation):
+        if generation != self._layout_generation:
+            # A search or a newer layout replaced this one
+            return
+        end = start + ITEM_BOX_STARTUP_CHUNK
+        self._append_categories(self._layout[start:end])
+        self._show_layout()
+        if end < len(self._layout):
+            self.root.after_idle(self._layout_chunk, end, generation)
+            return
+        self._prefetch_icons()
+        self._item_box_ready()
+    
+    def _category_rows(self, category, items, y, first_row):
+        """Item rows for one expanded category starting at ``y``, recording their item positions."""
+        rows = []
+        for start in range(0, len(items), ITEM_BOX_COLUMNS):
+            row_cells = []
+            for item_name, item_id, _ in items[start:start + ITEM_BOX_COLUMNS]:
+                self._item_positions[item_name] = (first_row + len(rows), len(row_cells))
+                row_cells.append((item_name, item_id))
+            rows.append((y, ITEM_BOX_CELL, "items", row_cells))
+            y += ITEM_BOX_CELL
+        return rows
+    
+    def _append_categories(self, layout):
+        rows = self._grid_rows
+        y = self._grid_height
+        for category, display_name, items in layout:
+            if category not in self.category_visible:
+                self.category_visible[category] = True
+            self._header_rows[category] = len(rows)
+            rows.append((y, ITEM_BOX_HEADER_HEIGHT, "header", (category, display_name, items)))
+            y += ITEM_BOX_HEADER_HEIGHT
+            if self.category_visible[category]:
+                item_rows = self._category_rows(category, items or self._cells(category), y, len(rows))
+                rows.extend(item_rows)
+                y += len(item_rows) * ITEM_BOX_CELL
+            y += ITEM_BOX_CATEGORY_GAP
+        self._grid_height = y
+        self._grid_row_tops = [row[0] for row in rows]
+    
+    def _show_layout(self):
+        self.canvas.configure(scrollregion=(0, 0, ITEM_BOX_COLUMNS * ITEM_BOX_CELL + 4, self._grid_height))
+        self._render_visible_rows()
+        self._update_selection_marker()
+    
+    def _visible_row_range(self):
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        first = max(bisect.bisect_right(self._grid_row_tops, top) - 1, 0)
+        last = bisect.bisect_right(self._grid_row_tops, bottom)
+        return first, last
+    
+    def _render_visible_rows(self):
+        if not hasattr(self, "_rendered_rows"):
+            return
+        first, last = self._visible_row_range()
+        for row_index in list(self._rendered_rows):
+            if not first <= row_index < last:
+                self._release_row(row_index)
+        for row_index in range(first, last):
+            if row_index not in self._rendered_rows:
+                self._draw_row(row_index)
+    
+    def _draw_row(self, row_index):
+        top, height, kind, payload = self._grid_rows[row_index]
+        if kind == "header":
+            text_id = self._free_texts.pop() if self._free_texts else self.canvas.create_text(
+                0, 0, anchor="nw", fill="gold", font=("Georgia", 10, "bold"))
+            arrow = "▼" if self.category_visible[payload[0]] else "►"
+            self.canvas.coords(text_id, 4, top + 5)
+            self.canvas.itemconfigure(text_id, text=f"{arrow} {payload[1]}", state="normal")
+            self._rendered_rows[row_index] = (kind, [text_id])
+            return
+        
+        image_ids = []
+        for col, (item_name, item_id) in enumerate(payload):
+            icon = ICON_CACHE.get((item_id, ITEM_ICON_SIZE), PLACEHOLDER_ICON)
+            image_id = self._free_images.pop() if self._free_images else self.canvas.create_image(0, 0)
+            self.canvas.coords(image_id, 2 + col * ITEM_BOX_CELL + ITEM_BOX_CELL // 2, top + ITEM_BOX_CELL // 2)
+            self.canvas.itemconfigure(image_id, image=icon, state="normal")
+            image_ids.append(image_id)
+            if item_id:
+                self._visible_icons.setdefault(item_id, []).append(image_id)
+                if icon is PLACEHOLDER_ICON:
+                    self.icon_loader.request(item_id, ITEM_ICON_SIZE,
+                                             lambda img, i=item_id: self._swap_item_icon(i, img), 0)
+        self._rendered_rows[row_index] = (kind, image_ids)
+    
+    def _release_row(self, row_index):
+        kind, ids = self._rendered_rows.pop(row_index)
+        for canvas_id in ids:
+            self.canvas.itemconfigure(canvas_id, state="hidden")
+        if kind == "header":
+            self._free_texts.extend(ids)
+            return
+        self._free_images.extend(ids)
+        for _, item_id in self._grid_rows[row_index][3]:
+            visible = self._visible_icons.get(item_id)
+            if visible:
+                visible[:] = [i for i in visible if i not in ids]
+                if not visible:
+                    del self._visible_icons[item_id]
+    
+    def _prefetch_icons(self, rows=None):
+        # Queue every icon in the layout, nearest to the viewport first
+        view_top = self.canvas.canvasy(0)
+        for top, _, kind, payload in self._grid_rows if rows is None else rows:
+            if kind != "items":
+                continue
+            priority = 1 + abs(top - view_top)
+            for _, item_id in payload:
+                if item_id and (item_id, ITEM_ICON_SIZE) not in ICON_CACHE:
+                    self.icon_loader.request(item_id, ITEM_ICON_SIZE,
+                                             lambda img, i=item_id: self._swap_item_icon(i, img), priority)
+    
+    def _swap_item_icon(self, item_id, icon):
+        for image_id in self._visible_icons.get(item_id, ()):
+            self.canvas.itemconfigure(image_id, image=icon)
+    
+    def _update_selection_marker(self):
+        pos = self._item_positions.get(self.selected_item_name)
+        if pos is None:
+            self.canvas.itemconfigure(self._selection_marker, state="hidden")
+            return
+        row_index, col = pos
+        top = self._grid_rows[row_index][0]
+        x = 2 + col * ITEM_BOX_CELL
+        self.canvas.coords(self._selection_marker, x + 2, top + 2, x + ITEM_BOX_CELL - 2, top + ITEM_BOX_CELL - 2)
+        self.canvas.itemconfigure(self._selection_marker, state="normal")
+        self.canvas.tag_raise(self._selection_marker)
+    
+    def _hit_test(self, event):
+        """Return ("header", category) or ("item", item_name) under the pointer, or None."""
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        row_index = bisect.bisect_right(self._grid_row_tops, y) - 1
+        if row_index < 0:
+            return None
+        top, height, kind, payload = self._grid_rows[row_index]
+        if y >= top + height:
+            return None
+        if kind == "header":
+            return ("header", payload[0])
+        col = int((x - 2) // ITEM_BOX_CELL)
+        if 0 <= col < len(payload) and x >= 2:
+            return ("item", payload[col][0])
+        return None
+    
+    def _on_item_box_click(self, event):
+        hit = self._hit_test(event)
+        if hit is None:
+            return
+        kind, value = hit
+        if kind == "header":
+            self._toggle_category(value)
+        else:
+            self._select_item(value)
+    
+    def _on_item_box_double_click(self, event):
+        hit = self._hit_test(event)
+        if hit and hit[0] == "item":
+            webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{hit[1].replace(' ', '_')}")
+    
+    def _on_item_box_right_click(self, event):
+        hit = self._hit_test(event)
+        if hit and hit[0] == "item":
+            self._select_and_show_context_menu(event, hit[1])
+    
+    def _on_item_box_motion(self, event):
+        hit = self._hit_test(event)
+        self.canvas.configure(cursor="hand2" if hit else "")
+        text = hit[1] if hit and hit[0] == "item" else None
+        self.item_tooltip.show_text(text, event.x_root, event.y_root)
+    
+    def _toggle_category(self, category):
+        """Expand or collapse one category: only its rows change, the rows below just move."""
+        self.category_visible[category] = not self.category_visible[category]
+        self._relayout_category(category)
+    
+    def _relayout_category(self, category):
+        """Rebuild the item rows under one category header and shift the rows below it."""
+        header = self._header_rows[category]
+        rows = self._grid_rows
+        end = header + 1
+        while end < len(rows) and rows[end][2] == "items":
+            end += 1
+        for row_index in [i for i in self._rendered_rows if i >= header]:
+            self._release_row(row_index)
+        
+        for _, _, _, payload in rows[header + 1:end]:
+            for item_name, _ in payload:
+                self._item_positions.pop(item_name, None)
+        new_rows = []
+        if self.category_visible[category]:
+            items = rows[header][3][2] or self._cells(category)
+            new_rows = self._category_rows(category, items, rows[header][0] + ITEM_BOX_HEADER_HEIGHT, header + 1)
+        
+        shift_rows = len(new_rows) - (end - header - 1)
+        shift_y = shift_rows * ITEM_BOX_CELL
+        tail = [(top + shift_y, height, kind, payload) for top, height, kind, payload in rows[end:]]
+        for row_index, (_, _, kind, payload) in enumerate(tail, end + shift_rows):
+            if kind == "header":
+                self._header_rows[payload[0]] = row_index
+            else:
+                for col, (item_name, _) in enumerate(payload):
+                    self._item_positions[item_name] = (row_index, col)
+        rows[header + 1:] = new_rows + tail
+        self._grid_height += shift_y
+        self._grid_row_tops = [row[0] for row in rows]
+        self._show_layout()
+        self._prefetch_icons(new_rows)
+    
+    def _schedule_filter(self):
+        # Debounce typing so a burst of keystrokes runs a single query
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DEBOUNCE_MS, self._filter_items)
+    
+    def _filter_items(self):
+        self._search_after = None
+        current = (self.search_entry.get(), self.tier_filter.get())
+        if current == self._last_filter:
+            return
+        self._last_filter = current
+        self._populate_item_box(*current)
+    
+    def _clear_search(self):
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+            self._search_after = None
+        self.search_entry.delete(0, tk.END)
+        self.tier_filter.set("All")
+        self._last_filter = ("", "All")
+        self._populate_item_box()
+    
+    def _select_item(self, item_name):
+        self.selected_item_name = item_name
+        self._update_selection_marker()
+        
+        item_data = self.item_lookup.get(item_name, {})
+        max_stack = item_data.get("MaxStackSize", 1)
+        self.label_maxstack.config(text=f"(Max: {max_stack})")
+        
+        current_count = self.entry_count.get()
+        try:
+            if int(current_count) > max_stack:
+                self.entry_count.delete(0, tk.END)
+                self.entry_count.insert(0, str(max_stack))
+        except:
+            pass
+    
+    def _select_slot(self, slot_index, update_range=True):
+        # Deselect all inventory slots - change border color only, not thickness
+        for idx, lbl in self.slot_labels.items():
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#222", highlightthickness=2)
+        
+        # Deselect all loadout slots
+        for lbl in self.loadout_labels:
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#222", highlightthickness=2)
+        
+        self.selected_loadout_index = None
+        
+        lbl = self.slot_labels.get(slot_index)
+        if lbl:
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#00ff00", highlightthickness=3)
+            self.selected_slot_index = slot_index
+            if update_range:
+                for entry in (self.entry_range_start, self.entry_range_end):
+                    entry.delete(0, tk.END)
+                    entry.insert(0, str(slot_index))
+    
+    def _select_loadout_slot(self, loadout_index):
+        # Deselect all inventory slots
+        for idx, lbl in self.slot_labels.items():
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#222", highlightthickness=2)
+        
+        # Deselect all loadout slots
+        for lbl in self.loadout_labels:
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#222", highlightthickness=2)
+        
+        self.selected_slot_index = None
+        
+        if loadout_index < len(self.loadout_labels):
+            lbl = self.loadout_labels[loadout_index]
+            frame = lbl.master
+            if frame:
+                frame.configure(highlightbackground="#00ff00", highlightthickness=3)
+            self.selected_loadout_index = loadout_index
+    
+    def _switch_tab(self, tab_name):
+        if tab_name == self.current_tab:
+            return
+        
+        for t, btn in self.tab_buttons.items():
+            img = self.tab_icons_selected.get(t) if t == tab_name else self.tab_icons.get(t)
+            if img:
+                btn.configure(image=img)
+        
+        self.tab_frames[self.current_tab].lower()
+        self.tab_frames[tab_name].lift()
+        self.current_tab = tab_name
+    
+    def _select_and_show_context_menu(self, event, item_name):
+        self._select_item(item_name)
+        self._show_item_context_menu(event, item_name)
+    
+    def _show_item_context_menu(self, event, item_name):
+        menu = tk.Menu(self.root, tearoff=0)
+        menu.add_command(label="Open in Wiki", command=lambda: webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{item_name.replace(' ', '_')}"))
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def _show_slot_context_menu(self, event, slot_index):
+        menu = tk.Menu(self.root, tearoff=0)
+        
+        if self.current_save_data:
+            inv = self.current_save_data.get("Inventory", {})
+            slot_data = inv.get(str(slot_index), {})
+            item_id = slot_data.get("ItemData")
+            item_name = ITEM_NAME_MAP.get(item_id)
+            
+            if item_name:
+                menu.add_command(label=f"Open '{item_name}' in Wiki", 
+                    command=lambda: webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{item_name.replace(' ', '_')}"))
+                menu.add_separator()
+        
+        menu.add_command(label="Clear Slot", command=lambda: self._clear_specific_slot(slot_index))
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def _show_loadout_context_menu(self, event, loadout_index):
+        menu = tk.Menu(self.root, tearoff=0)
+        
+        if self.current_save_data:
+            loadout = self.current_save_data.get("Loadout", {})
+            slot_data = loadout.get(str(loadout_index), {})
+            item_id = slot_data.get("ItemData")
+            item_name = ITEM_NAME_MAP.get(item_id)
+            
+            if item_name:
+                menu.add_command(label=f"Open '{item_name}' in Wiki",
+                    command=lambda: webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{item_name.replace(' ', '_')}"))
+                menu.add_separator()
+            
+            menu.add_command(label="Clear Slot", command=lambda: self._clear_loadout_slot(loadout_index))
+        
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def _add_item(self):
+        if not self.current_file_path:
+            messagebox.showerror("Error", "Please load a save file first.")
+            return
+        
+        if self.selected_slot_index is None and self.selected_loadout_index is None:
+            messagebox.showerror("Error", "Please select an inventory or equipment slot.")
+            return
+        
+        if not self.selected_item_name:
+            messagebox.showerror("Error", "Please select an item to add.")
+            return
+        
+        item_data = self.item_lookup.get(self.selected_item_name)
+        if not item_data:
+            messagebox.showerror("Error", "Invalid item selection.")
+            return
+        
+        try:
+            # Handle loadout/equipment slot
+            if self.selected_loadout_index is not None:
+                self.document.equip_item(self.selected_loadout_index, item_data)
+            else:
+                try:
+                    count = int(self.entry_count.get())
+                except ValueError:
+                    messagebox.showerror("Error", "Invalid quantity.")
+                    return
+                
+                clamped = clamp_count(item_data, count)
+                if clamped < count:
+                    self.entry_count.delete(0, tk.END)
+                    self.entry_count.insert(0, str(clamped))
+                self.document.add_item(self.selected_slot_index, item_data, clamped)
+        except SaveEditError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        self._schedule_save()
+        self._refresh_inventory()
+    
+    def _fill_range(self):
+        if not self.current_file_path:
+            messagebox.showerror("Error", "Please load a save file first.")
+            return
+        
+        if not self.selected_item_name:
+            messagebox.showerror("Error", "Please select an item to add.")
+            return
+        
+        item_data = self.item_lookup.get(self.selected_item_name)
+        if not item_data:
+            messagebox.showerror("Error", "Invalid item selection.")
+            return
+        
+        try:
+            start = int(self.entry_range_start.get())
+            end = int(self.entry_range_end.get())
+            count = int(self.entry_count.get())
+        except ValueError:
+            messagebox.showerror("Error", "Slot range and quantity must be numbers.")
+            return
+        
+        try:
+            filled = self.document.fill_slots(start, end, item_data, count)
+        except SaveEditError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        if filled:
+            self._schedule_save()
+            self._refresh_inventory()
+    
+    def _clear_slot(self):
+        if self.selected_slot_index is None and self.selected_loadout_index is None:
+            messagebox.showerror("Error", "Please select an inventory or equipment slot to clear.")
+            return
+        
+        if self.selected_loadout_index is not None:
+            self._clear_loadout_slot(self.selected_loadout_index)
+        else:
+            self._clear_specific_slot(self.selected_slot_index)
+    
+    def _clear_specific_slot(self, slot_index):
+        if not self.current_file_path or not self.current_save_data:
+            messagebox.showerror("Error", "Please load a save file first.")
+            return
+        
+        if self.document.clear_slot(slot_index):
+            self._schedule_save()
+            self._refresh_inventory()
+    
+    def _clear_loadout_slot(self, loadout_index):
+        if not self.current_file_path or not self.current_save_data:
+            messagebox.showerror("Error", "Please load a save file first.")
+            return
+        
+        if self.document.clear_loadout_slot(loadout_index):
+            self._schedule_save()
+            self._refresh_inventory()
+    
+    def _undo(self):
+        if self.document is None:
+            return
+        step = self.document.undo()
+        if step is not None:
+            self._schedule_save()
+            self._refresh_inventory()
+            self.label_save_status.config(text=f"Undid: {step.label}", foreground="orange")
+    
+    def _redo(self):
+        if self.document is None:
+            return
+        step = self.document.redo()
+        if step is not None:
+            self._schedule_save()
+            self._refresh_inventory()
+            self.label_save_status.config(text=f"Redid: {step.label}", foreground="orange")
+    
+    def _schedule_save(self):
+        # Coalesce bursts of edits into one write once editing pauses
+        if self._save_after is not None:
+            self.root.after_cancel(self._save_after)
+        self._save_after = self.root.after(SAVE_DEBOUNCE_MS, self._save_file)
+        self._update_save_status()
+    
+    @timed("_save_file")
+    def _save_file(self):
+        if self._save_after is not None:
+            self.root.after_cancel(self._save_after)
+            self._save_after = None
+        if self._conflict_dialog_open:
+            return False
+        if not self.current_file_path or not self.current_save_data or not self.document.dirty:
+            self._update_save_status()
+            return True
+        
+        try:
+            self.document.save()
+        except SaveConflictError as e:
+            return self._resolve_conflict(e)
+        except Exception as e:
+            self._update_save_status(failed=True)
+            messagebox.showerror("Error", f"Failed to save: {e}")
+            return False
+        self._update_save_status()
+        self._refresh_inventory()
+        return True
+    
+    def _poll_disk(self):
+        self.root.after(DISK_POLL_MS, self._poll_disk)
+        if item_list_changed():
+            self._reload_catalog()
+        if self.document is None or self._conflict_pending:
+            return
+        try:
+            if not self.document.disk_changed():
+                return
+            self.document.reload()
+        except SaveConflictError as e:
+            self._resolve_conflict(e)
+            return
+        except Exception as e:
+            print(f"Could not reload {self.current_file_path}: {e}")
+            return
+        self._refresh_inventory()
+        self._update_undo_buttons()
+        self.label_save_status.config(text="Reloaded changes from disk", foreground="gray")
+    
+    def _reload_catalog(self):
+        """Pick up an edited ItemID.txt: patch the lookups, drop stale icons and redraw only what changed."""
+        try:
+            change = save_core.reload_item_list()
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Could not reload ItemID.txt: {e}")
+            return
+        if not change:
+            return
+        self.catalog = save_core.CATALOG
+        self.item_lookup = self.catalog.by_name
+        self.categorized_items = self.catalog.categories
+        
+        stale = change.icon_changed_ids()
+        for cache_key in [k for k in ICON_CACHE if k[0] in stale]:
+            del ICON_CACHE[cache_key]
+        
+        categories = change.categories()
+        for category in categories:
+            self._category_cells.pop(category, None)
+        names = [c for c in sorted(self.categorized_items.keys()) if c and c.strip()]
+        current = (self.search_entry.get(), self.tier_filter.get())
+        if names != self._categories or current != ("", "All"):
+            # Categories appeared or vanished, or a search is showing: lay everything out again
+            self._categories = names
+            self._populate_item_box(*current)
+        else:
+            for category in categories & self._header_rows.keys():
+                header = self._header_rows[category]
+                top, height, kind, _ = self._grid_rows[header]
+                display_name = self.categorized_items[category][0].category
+                self._grid_rows[header] = (top, height, kind, (category, display_name, None))
+                self._relayout_category(category)
+        if self.selected_item_name not in self.item_lookup:
+            self.selected_item_name = None
+            self._update_selection_marker()
+        
+        # Slots showing an affected item are repainted on the next refresh
+        affected = {r.persistence_id for r in change.added + change.removed}
+        affected.update(new.persistence_id for _, new in change.changed)
+        for key, state in list(self._rendered_slots.items()):
+            if state and state[0] in affected:
+                del self._rendered_slots[key]
+        self._refresh_inventory()
+        threading.Thread(target=search_index, name="search-index", daemon=True).start()
+        self.label_save_status.config(
+            text=f"Item list updated: {len(change.added)} added, {len(change.removed)} removed, "
+                 f"{len(change.changed)} changed", foreground="gray")
+    
+    def _resolve_conflict(self, error):
+        """Ask whether to keep this window's edits or the version on disk. Returns True once resolved."""
+        self._conflict_pending = True
+        if self._save_after is not None:
+            self.root.after_cancel(self._save_after)
+            self._save_after = None
+        self._conflict_dialog_open = True
+        try:
+            keep_mine = messagebox.askyesnocancel(
+                "Save Changed on Disk",
+                f"{error}\n\nYes: overwrite it with your edits.\nNo: discard your edits and load the file from disk.\n"
+                "Cancel: decide on the next save.")
+        finally:
+            self._conflict_dialog_open = False
+        if keep_mine is None:
+            self._update_save_status(failed=True)
+            return False
+        try:
+            if keep_mine:
+                self.document.save(force=True)
+            else:
+                self.document.revert()
+        except Exception as e:
+            self._update_save_status(failed=True)
+            messagebox.showerror("Error", f"Failed to save: {e}")
+            return False
+        self._conflict_pending = False
+        self._update_save_status()
+        self._refresh_inventory()
+        return True
+    
+    def _update_undo_buttons(self):
+        history = self.document.history if self.document is not None else None
+        self.btn_undo.config(state="normal" if history is not None and history.can_undo else "disabled")
+        self.btn_redo.config(state="normal" if history is not None and history.can_redo else "disabled")
+    
+    def _update_save_status(self, failed=False):
+        self._update_undo_buttons()
+        if failed:
+            self.label_save_status.config(text="● Save failed", foreground="red")
+        elif self.document is not None and self.document.dirty:
+            self.label_save_status.config(text="● Unsaved changes", foreground="orange")
+        elif self.document is not None:
+            self.label_save_status.config(text="All changes saved", foreground="gray")
+        else:
+            self.label_save_status.config(text="")
+    
+    def _on_close(self):
+        if not self._save_file():
+            if not messagebox.askyesno("Unsaved Changes", "The save could not be written. Quit anyway?"):
+                return
+        self.root.destroy()
+    
+    def _load_json(self):
+        initdir = DEFAULT_SAVE_DIR if os.path.exists(DEFAULT_SAVE_DIR) else os.getcwd()
+        fp = filedialog.askopenfilename(initialdir=initdir, title="Select Save File", filetypes=[("JSON", "*.json")])
+        
+        if not fp:
+            return
+        
+        # Flush pending edits to the current file before switching documents
+        if not self._save_file():
+            return
+        
+        self._open_save(fp)
+    
+    @timed("_load_json")
+    def _open_save(self, fp):
+        try:
+            self.document = SaveDocument.load(fp)
+            self._conflict_pending = False
+            self.current_save_data = self.document.data
+            self.current_file_path = fp
+            self.entry_file.delete(0, tk.END)
+            self.entry_file.insert(0, fp)
+            self._update_save_status()
+            self._refresh_inventory()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load save file: {e}")
+    
+    def _open_save_index_panel(self):
+        if self._index_panel is not None and self._index_panel.winfo_exists():
+            self._index_panel.lift()
+            return
+        
+        directory = os.path.dirname(self.current_file_path) if self.current_file_path else DEFAULT_SAVE_DIR
+        panel = tk.Toplevel(self.root, bg="#1c1b18")
+        panel.title("Find in Saves")
+        panel.geometry("520x420")
+        self._index_panel = panel
+        
+        top = tk.Frame(panel, bg="#1c1b18")
+        top.pack(fill="x", padx=10, pady=(10, 5))
+        self._index_dir_label = ttk.Label(top, text=directory)
+        self._index_dir_label.pack(side="left", fill="x", expand=True)
+        ttk.Button(top, text="Folder...", command=self._choose_index_dir).pack(side="left", padx=5)
+        ttk.Button(top, text="Rescan", command=self._refresh_save_index).pack(side="left")
+        
+        query_row = tk.Frame(panel, bg="#1c1b18")
+        query_row.pack(fill="x", padx=10, pady=5)
+        ttk.Label(query_row, text="Item:").pack(side="left")
+        self._index_query = ttk.Entry(query_row, width=30)
+        self._index_query.pack(side="left", padx=5)
+        self._index_query.bind("<KeyRelease>", lambda e: self._schedule_index_query())
+        self._index_item_label = ttk.Label(query_row, text="", foreground="gray")
+        self._index_item_label.pack(side="left", padx=5)
+        
+        self._index_tree = ttk.Treeview(panel, columns=("save", "inventory", "equipped"), show="headings")
+        for col, heading, width in (("save", "Save", 300), ("inventory", "Inventory", 90), ("equipped", "Equipped", 90)):
+            self._index_tree.heading(col, text=heading)
+            self._index_tree.column(col, width=width, anchor="w" if col == "save" else "e")
+        self._index_tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self._index_tree.bind("<Double-1>", lambda e: self._open_index_selection())
+        self._index_query_after = None
+        
+        self._set_index_dir(directory)
+        self._index_query.focus_set()
+    
+    def _choose_index_dir(self):
+        directory = filedialog.askdirectory(parent=self._index_panel, initialdir=self.save_index.directory if self.save_index else None)
+        if directory:
+            self._set_index_dir(directory)
+    
+    def _set_index_dir(self, directory):
+        if self.save_index is None or self.save_index.directory != directory:
+            self.save_index = SaveIndex(directory)
+        self._index_dir_label.configure(text=directory)
+        # Answer from the cached index at once; the rescan reruns the query when it lands
+        self._run_index_query()
+        self._refresh_save_index()
+    
+    def _refresh_save_index(self):
+        """Re-read new or changed saves on a worker thread, then rerun the current query."""
+        index = self.save_index
+        if self._index_refresh is not None and self._index_refresh[0] is index:
+            return
+        thread = threading.Thread(target=self._rescan_save_index, args=(index,), name="save-index", daemon=True)
+        thread.start()
+        self._index_refresh = (index, thread)
+        self._index_item_label.configure(text="Scanning saves...")
+        self.root.after(INDEX_POLL_MS, self._poll_index_refresh, index, thread)
+    
+    def _rescan_save_index(self, index):
+        try:
+            index.refresh()
+        except Exception as e:
+            print(f"Could not rescan {index.directory}: {e}")
+    
+    def _poll_index_refresh(self, index, thread):
+        if thread.is_alive():
+            self.root.after(INDEX_POLL_MS, self._poll_index_refresh, index, thread)
+            return
+        if self._index_refresh != (index, thread):
+            return
+        self._index_refresh = None
+        if index is self.save_index and self._index_panel is not None and self._index_panel.winfo_exists():
+            self._run_index_query()
+    
+    def _schedule_index_query(self):
+        if self._index_query_after is not None:
+            self._index_panel.after_cancel(self._index_query_after)
+        self._index_query_after = self._index_panel.after(SEARCH_DEBOUNCE_MS, self._run_index_query)
+    
+    def _run_index_query(self):
+        self._index_query_after = None
+        self._index_tree.delete(*self._index_tree.get_children())
+        text = self._index_query.get().strip()
+        if not text:
+            self._index_item_label.configure(text=f"{len(self.save_index)} saves indexed")
+            return
+        
+        hits = search_index().search(text, limit=1)
+        record = self.catalog.get(hits[0][1]) if hits else None
+        if record is None:
+            self._index_item_label.configure(text="No matching item")
+            return
+        
+        rows = self.save_index.holders(record.persistence_id)
+        self._index_item_label.configure(text=f"{record.name}: {len(rows)} of {len(self.save_index)} saves")
+        for path, inventory_count, equipped in rows:
+            self._index_tree.insert("", "end", iid=path, values=(os.path.basename(path), inventory_count, equipped))
+    
+    def _open_index_selection(self):
+        selection = self._index_tree.selection()
+        if not selection or not self._save_file():
+            return
+        self._open_save(selection[0])
+    
+    @timed("_refresh_inventory", outcome=lambda touched: {"widgets_touched": touched})
+    def _refresh_inventory(self):
+        """Repaint only the slots whose item, count or power level changed since the last refresh.
+        
+        Returns the number of slot widgets touched, also kept in ``last_refresh_touched``.
+        """
+        if not self.current_save_data:
+            return 0
+        
+        inventory = self.current_save_data.get("Inventory", {})
+        loadout = self.current_save_data.get("Loadout", {})
+        wanted = {}
+        
+        for slot_str, entry in inventory.items():
+            if not slot_str.isdigit():
+                continue
+            slot_idx = int(slot_str)
+            if slot_idx in self.slot_labels:
+                item_id = entry.get("ItemData")
+                wanted[slot_idx] = (item_id, entry.get("Count"), POWER_MAP.get(item_id))
+        
+        for slot_str, entry in loadout.items():
+            if not slot_str.isdigit():
+                continue
+            slot_idx = int(slot_str)
+            if slot_idx >= len(self.loadout_labels):
+                continue
+            item_id = entry.get("ItemData")
+            if not item_id and "PlayerInventoryItemIndex" in entry:
+                ref = str(entry["PlayerInventoryItemIndex"])
+                item_id = inventory.get(ref, {}).get("ItemData")
+            wanted[("loadout", slot_idx)] = (item_id, entry.get("Count"), POWER_MAP.get(item_id))
+        
+        touched = 0
+        for idx, lbl in self.slot_labels.items():
+            state = wanted.get(idx)
+            if self._rendered_slots.get(idx) != state:
+                self._paint_slot(lbl, state, SLOT_SIZE - 8)
+                self._rendered_slots[idx] = state
+                touched += 1
+        
+        for i, lbl in enumerate(self.loadout_labels):
+            key = ("loadout", i)
+            state = wanted.get(key)
+            if self._rendered_slots.get(key) != state:
+                placeholder = self._loadout_placeholder_icons[i] if i < len(self._loadout_placeholder_icons) else None
+                self._paint_slot(lbl, state, 46, placeholder)
+                self._rendered_slots[key] = state
+                touched += 1
+        
+        self.last_refresh_touched = touched
+        return touched
+    
+    def _paint_slot(self, lbl, state, icon_size, placeholder=None):
+        """Draw one slot for ``state`` = (ItemData, Count, power level), or empty it if None."""
+        icon = get_icon_image(state[0], icon_size) if state else None
+        
+        if icon:
+            lbl.configure(image=icon, text="")
+            lbl.image = icon
+            self._set_count_badge(lbl, state[1])
+            self._set_power_badge(lbl, state[0])
+            tip_text = ITEM_NAME_MAP.get(state[0], "Unknown")
+        else:
+            if placeholder is not None:
+                lbl.configure(image=placeholder)
+                lbl.image = placeholder
+            elif hasattr(lbl, "loadout_index"):
+                lbl.configure(image="")
+                lbl.image = None
+            else:
+                lbl.configure(image="", text="", bg="#444")
+                lbl.image = None
+            self._set_count_badge(lbl, None)
+            self._set_power_badge(lbl, None)
+            tip_text = ""
+        
+        tip = getattr(lbl, "_tooltip", None)
+        if tip is None:
+            lbl._tooltip = ToolTip(lbl, tip_text)
+        else:
+            tip.text = tip_text
+    
+    def _set_count_badge(self, parent_lbl, count):
+        badge = getattr(parent_lbl, "_count_badge", None)
+        if badge is None:
+            badge = tk.Label(parent_lbl, text="", fg="white", bg="#444", font=("Consolas", 9, "bold"))
+            badge.place(relx=1.0, rely=1.0, anchor="se")
+            parent_lbl._count_badge = badge
+        
+        if count is None or count <= 1:
+            badge.place_forget()
+        else:
+            badge.config(text=str(count))
+            badge.place(relx=1.0, rely=1.0, anchor="se")
+    
+    def _set_power_badge(self, parent_lbl, item_id):
+        badge = getattr(parent_lbl, "_power_badge", None)
+        if badge is None:
+            badge = tk.Label(parent_lbl, image="", bd=0, bg=parent_lbl["bg"])
+            badge.place(relx=0, rely=0, anchor="nw")
+            parent_lbl._power_badge = badge
+        
+        lvl = POWER_MAP.get(item_id)
+        if lvl in POWER_BADGES:
+            badge.config(image=POWER_BADGES[lvl])
+            badge.image = POWER_BADGES[lvl]
+            badge.place(relx=0, rely=0, anchor="nw")
+        else:
+            badge.place_forget()
+    
+    def _bind_scroll_increment(self, entry_widget):
+        def on_scroll(event):
+            try:
+                val = int(entry_widget.get())
+                if event.delta > 0:
+                    val += 1
+                else:
+                    val = max(1, val - 1)
+                
+                if self.selected_item_name:
+                    item_data = self.item_lookup.get(self.selected_item_name, {})
+                    max_stack = item_data.get("MaxStackSize", 99)
+                    val = min(val, max_stack)
+                
+                entry_widget.delete(0, tk.END)
+                entry_widget.insert(0, str(val))
+            except ValueError:
+                pass
+        entry_widget.bind("<MouseWheel>", on_scroll)
+
+def run():
+    if os.environ.get("RSD_CACHE_STATS"):
+        import atexit
+        atexit.register(lambda: print(THUMB_CACHE.report()))
+    root = tk.Tk()
+    app = SaveEditor(root)
+    root.mainloop()
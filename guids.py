@@ -0,0 +1,78 @@
+"""Entry GUIDs in the game's format, unique within one save.
+
+The game writes 16 random bytes as 22 characters of unpadded base64url, the
+same shape as the PersistenceIDs in ItemID.txt. ``random_guids`` encodes a
+whole batch with a single b64encode call; ``GuidAllocator`` hands them out
+while checking each one against the GUIDs already in the save.
+"""
+import base64
+import os
+import re
+
+GUID_LENGTH = 22
+BATCH = 256
+_GUID_FIELD = re.compile(rb'"GUID"\s*:\s*"([^"\\]*)"')
+
+
+def random_guids(n):
+    """``n`` fresh random GUIDs (not checked against anything)."""
+    # 18 bytes encode to exactly 24 characters, so groups can share one b64encode call;
+    # with the last two bytes zeroed, the first 22 characters are the unpadded encoding of the other 16
+    raw = bytearray(os.urandom(18 * n))
+    raw[16::18] = bytes(n)
+    raw[17::18] = bytes(n)
+    encoded = base64.urlsafe_b64encode(raw).decode("ascii")
+    return [encoded[i:i + GUID_LENGTH] for i in range(0, 24 * n, 24)]
+
+
+def guids_in_bytes(raw):
+    """Every "GUID" value in a save's JSON bytes, found without parsing them."""
+    return {match.decode("utf-8", "replace") for match in _GUID_FIELD.findall(raw)}
+
+
+def collect_guids(value, into):
+    """Add every "GUID" value found in decoded JSON to the set ``into``."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            guid = value.get("GUID")
+            if isinstance(guid, str):
+                into.add(guid)
+            stack.extend(v for v in value.values() if isinstance(v, (dict, list)))
+        elif isinstance(value, list):
+            stack.extend(v for v in value if isinstance(v, (dict, list)))
+    return into
+
+
+class GuidAllocator:
+    """Allocates GUIDs that no entry in the save uses yet.
+
+    ``used`` only grows: a GUID freed by clearing a slot is not handed out
+    again, so undoing the clear can never produce a duplicate.
+    """
+
+    def __init__(self, used=()):
+        self.used = set(used)
+        self._pool = []
+
+    def __len__(self):
+        return len(self.used)
+
+    def __contains__(self, guid):
+        return guid in self.used
+
+    def allocate(self):
+        return self.allocate_many(1)[0]
+
+    def allocate_many(self, n):
+        guids = []
+        used = self.used
+        while len(guids) < n:
+            if not self._pool:
+                self._pool = random_guids(max(BATCH, n - len(guids)))
+            guid = self._pool.pop()
+            if guid not in used:
+                used.add(guid)
+                guids.append(guid)
+        return guids
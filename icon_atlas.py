@@ -0,0 +1,184 @@
+"""Prebuilt icon atlas.
+
+Every icon referenced by ItemID.txt is resized once to each size the editor
+draws and packed as raw RGBA into a single file. At runtime the file is
+memory-mapped and icons are sliced out of it with no PNG decoding or
+resampling. Run ``python icon_atlas.py`` to build it offline; the editor
+also rebuilds it automatically whenever ItemID.txt or the UI folder changes.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+ATLAS_MAGIC = b"RSDATL01"
+ATLAS_FILENAME = "icon_atlas.bin"
+PLACEHOLDER_ICON_FILE = "ICON PLACEHOLDER.png"
+_HEADER = struct.Struct("<8sI")
+
+
+def atlas_fingerprint(item_path, ui_dir, sizes):
+    """Hash of everything the atlas contents depend on."""
+    h = hashlib.sha1()
+    h.update(ATLAS_MAGIC)
+    h.update(repr(tuple(sizes)).encode())
+    try:
+        st = os.stat(item_path)
+        h.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    except OSError:
+        h.update(b"no-item-list")
+    try:
+        with os.scandir(ui_dir) as it:
+            entries = sorted((e.name, e.stat()) for e in it if e.is_file())
+    except OSError:
+        entries = []
+    for name, st in entries:
+        h.update(f"{name}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()
+
+
+def _icon_names(item_path):
+    with open(item_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    names = {entry.get("IconFile") for entry in data}
+    names.discard(None)
+    names.discard("")
+    names.add(PLACEHOLDER_ICON_FILE)
+    return sorted(names)
+
+
+def _render_icon(ui_dir, icon_name, sizes):
+    from PIL import Image
+
+    p = os.path.join(ui_dir, icon_name)
+    if not os.path.exists(p):
+        return icon_name, None
+    try:
+        img = Image.open(p).convert("RGBA")
+        return icon_name, [img.resize((s, s), Image.LANCZOS).tobytes() for s in sizes]
+    except Exception as e:
+        print(f"Atlas: skipping {icon_name}: {e}")
+        return icon_name, None
+
+
+def build_atlas(out_path, item_path, ui_dir, sizes):
+    """Decode, resize and pack every icon. Returns the number of icons packed."""
+    sizes = tuple(sizes)
+    names = _icon_names(item_path)
+    fingerprint = atlas_fingerprint(item_path, ui_dir, sizes)
+
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        rendered = list(pool.map(lambda n: _render_icon(ui_dir, n, sizes), names))
+
+    index = {}
+    blobs = []
+    offset = 0
+    for icon_name, pixels in rendered:
+        if pixels is None:
+            continue
+        slots = {}
+        for size, blob in zip(sizes, pixels):
+            slots[str(size)] = offset
+            blobs.append(blob)
+            offset += len(blob)
+        index[icon_name] = slots
+
+    header = json.dumps({"fingerprint": fingerprint, "sizes": list(sizes), "icons": index},
+                        separators=(",", ":")).encode("utf-8")
+
+    directory = os.path.dirname(out_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # A private temp file, so two processes building the atlas at once cannot clobber each other's
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(out_path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(ATLAS_MAGIC, len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(index)
+
+
+class IconAtlas:
+    """Read-only view over a memory-mapped atlas file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_len = _HEADER.unpack_from(self._map, 0)
+            if magic != ATLAS_MAGIC:
+                raise ValueError("not an icon atlas")
+            start = _HEADER.size
+            header = json.loads(self._map[start:start + header_len].decode("utf-8"))
+        except Exception:
+            self._file.close()
+            raise
+        self.fingerprint = header["fingerprint"]
+        self.sizes = tuple(header["sizes"])
+        self._data_start = start + header_len
+        self._icons = {
+            name: {int(size): off for size, off in slots.items()}
+            for name, slots in header["icons"].items()
+        }
+        self._view = memoryview(self._map)
+
+    def __contains__(self, icon_name):
+        return icon_name in self._icons
+
+    def get(self, icon_name, size):
+        """Raw RGBA pixels for ``icon_name`` at ``size``, or None if not packed."""
+        slots = self._icons.get(icon_name)
+        if not slots:
+            return None
+        off = slots.get(size)
+        if off is None:
+            return None
+        start = self._data_start + off
+        return self._view[start:start + size * size * 4]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def load_atlas(atlas_path, item_path, ui_dir, sizes, rebuild=True):
+    """Open the atlas, rebuilding it first if its inputs have changed."""
+    fingerprint = atlas_fingerprint(item_path, ui_dir, sizes)
+    if os.path.exists(atlas_path):
+        try:
+            atlas = IconAtlas(atlas_path)
+            if atlas.fingerprint == fingerprint and atlas.sizes == tuple(sizes):
+                return atlas
+            atlas.close()
+        except Exception as e:
+            print(f"Icon atlas unreadable, rebuilding: {e}")
+    if not rebuild or not os.path.exists(item_path):
+        return None
+    try:
+        build_atlas(atlas_path, item_path, ui_dir, sizes)
+        return IconAtlas(atlas_path)
+    except Exception as e:
+        print(f"Failed to build icon atlas: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import editor_gui
+
+    out = sys.argv[1] if len(sys.argv) > 1 else editor_gui.ATLAS_PATH
+    count = build_atlas(out, editor_gui.ITEM_LIST_PATH, editor_gui.UI_DIR, editor_gui.ATLAS_SIZES)
+    print(f"Packed {count} icons at sizes {editor_gui.ATLAS_SIZES} into {out}")
@@ -0,0 +1,175 @@
+"""Opt-in timing of the editor's hot paths.
+
+Set ``RSD_PROFILE=1`` (or ``RSD_PROFILE=<file>``), or start the GUI with
+``save_editor.py gui --profile``, to log one JSON object per line for each
+timed call, tagged with the live Tk widget count and icon cache size.
+``RSD_PROFILE_OVERLAY=1`` / ``--overlay`` also shows the latest numbers in
+the window.
+
+Instrumentation is decided when modules are imported: with profiling off,
+``timed`` returns the function unchanged, so there is no wrapper at all.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+_recorder = None
+_gauges = {}
+overlay_requested = False
+
+
+class Recorder:
+    def __init__(self, path=None):
+        # Opened on first write, so enabling from the environment never imports save_core mid-import
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        # span name -> [calls, total ms, max ms]
+        self.totals = {}
+        self.counters = {}
+        self.last = {}
+        atexit.register(self.close)
+
+    def record(self, name, ms, quiet, fields):
+        with self._lock:
+            stats = self.totals.get(name)
+            if stats is None:
+                stats = self.totals[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += ms
+            if ms > stats[2]:
+                stats[2] = ms
+            for key, value in fields.items():
+                if value is True:
+                    counter = f"{name}.{key}"
+                    self.counters[counter] = self.counters.get(counter, 0) + 1
+            if quiet:
+                return
+            self.last[name] = ms
+            event = {"t": round(time.time(), 3), "span": name, "ms": round(ms, 3)}
+            event.update(fields)
+            event.update(read_gauges())
+            self._write(event)
+
+    def event(self, name, fields):
+        with self._lock:
+            event = {"t": round(time.time(), 3), "event": name}
+            event.update(fields)
+            event.update(read_gauges())
+            self._write(event)
+
+    def _write(self, event):
+        if self._file is None:
+            self.path = self.path or default_log_path()
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1 << 16)
+        self._file.write(json.dumps(event) + "\n")
+
+    def summary(self):
+        with self._lock:
+            return {
+                "totals": {name: {"calls": c, "total_ms": round(t, 3), "max_ms": round(m, 3)}
+                           for name, (c, t, m) in self.totals.items()},
+                "counters": dict(self.counters),
+            }
+
+    def close(self):
+        if self._file is not None and self._file.closed:
+            return
+        event = {"t": round(time.time(), 3), "summary": self.summary()}
+        event.update(read_gauges())
+        with self._lock:
+            self._write(event)
+            self._file.close()
+
+
+def default_log_path():
+    from save_core import CACHE_DIR
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, "profile.jsonl")
+
+
+def enable(path=None, overlay=False):
+    """Turn profiling on. Must run before the instrumented modules are imported."""
+    global _recorder, overlay_requested
+    if _recorder is None:
+        _recorder = Recorder(path)
+    overlay_requested = overlay_requested or overlay
+    return _recorder
+
+
+def enabled():
+    return _recorder is not None
+
+
+def recorder():
+    return _recorder
+
+
+def event(name, **fields):
+    """Log a one-off event (such as the startup report) when profiling is on."""
+    if _recorder is not None:
+        _recorder.event(name, fields)
+
+
+def count_widgets(root):
+    """Live Tk widgets under ``root``, counted from tkinter's own child maps (no Tcl round trips)."""
+    count = 0
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        count += 1
+        stack.extend(widget.children.values())
+    return count
+
+
+def register_gauge(name, fn):
+    """Sample ``fn()`` into every logged event while profiling is on."""
+    if _recorder is not None:
+        _gauges[name] = fn
+
+
+def read_gauges():
+    values = {}
+    for name, fn in _gauges.items():
+        try:
+            values[name] = fn()
+        except Exception:
+            values[name] = None
+    return values
+
+
+def timed(name, quiet=False, tags=None, outcome=None):
+    """Time every call of the decorated function when profiling is enabled.
+
+    ``quiet`` spans (called per icon, per row) only feed the totals and the
+    exit summary instead of writing a line each. ``tags(*args, **kwargs)``
+    returns extra fields computed before the call, ``outcome(result)`` ones
+    computed from its return value.
+    """
+    def decorate(fn):
+        if _recorder is None:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            fields = tags(*args, **kwargs) if tags else {}
+            t0 = time.perf_counter()
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                if outcome:
+                    fields.update(outcome(result))
+                _recorder.record(name, ms, quiet, fields)
+        return wrapper
+    return decorate
+
+
+if os.environ.get("RSD_PROFILE"):
+    value = os.environ["RSD_PROFILE"]
+    enable(None if value == "1" else value, bool(os.environ.get("RSD_PROFILE_OVERLAY")))
@@ -0,0 +1,167 @@
+"""Search index over the item catalog.
+
+Built once from ItemID.txt entries; queries return the set of matching item
+names without rescanning or re-lowercasing the catalog. Every fragment of
+every word is posted, so a query word matches anywhere inside an item word,
+the same as the old substring filter.
+
+``search`` adds ranked fuzzy matching on top: trigram postings over
+SourceString, Category and PersistenceID score candidates by overlap, so
+typos and partial words still find something and exact hits sort first.
+"""
+import json
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+FUZZY_MIN_SCORE = 0.35
+# Field weights for trigram similarity; an exact substring hit on the name adds EXACT_BONUS
+NAME_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.6
+ID_WEIGHT = 0.8
+EXACT_BONUS = 1.0
+PREFIX_BONUS = 0.5
+
+
+def normalize(text):
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ItemSearchIndex:
+    def __init__(self, entries):
+        self.names = []
+        self.normalized = []
+        self.ids = []
+        self.categories = []
+        self._fragments = {}
+        self._grams = {"name": {}, "category": {}, "id": {}}
+        self._gram_counts = {"name": [], "category": [], "id": []}
+        self._by_power = {}
+        self._query_cache = {}
+
+        for entry in entries:
+            name = entry.get("SourceString", "").strip()
+            if not name:
+                continue
+            norm = normalize(name)
+            doc = len(self.names)
+            pid = entry.get("PersistenceID") or ""
+            category = entry.get("Category") or ""
+            self.names.append(name)
+            self.normalized.append(norm)
+            self.ids.append(pid)
+            self.categories.append(category)
+            # PersistenceIDs are case-sensitive base64, so they are indexed verbatim
+            for field, text in (("name", norm), ("category", normalize(category)), ("id", pid)):
+                grams = trigrams(text) if text else set()
+                self._gram_counts[field].append(len(grams))
+                postings = self._grams[field]
+                for gram in grams:
+                    postings.setdefault(gram, []).append(doc)
+            for token in set(norm.split()):
+                for start in range(len(token)):
+                    for end in range(start + 1, len(token) + 1):
+                        self._fragments.setdefault(token[start:end], set()).add(name)
+            pwr = entry.get("PowerLevel")
+            if pwr is not None:
+                self._by_power.setdefault(pwr, set()).add(name)
+
+        self.all_names = frozenset(self.names)
+        self._doc_by_name = {name: doc for doc, name in enumerate(self.names)}
+        self._doc_by_id = {pid: doc for doc, pid in enumerate(self.ids) if pid}
+
+    def query(self, text="", power_level=None):
+        """Names matching every word of ``text`` (and ``power_level``, if given)."""
+        key = (normalize(text), power_level)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.all_names
+        for token in key[0].split():
+            result = result & self._fragments.get(token, frozenset())
+            if not result:
+                break
+        if power_level is not None:
+            result = result & self._by_power.get(power_level, frozenset())
+        result = frozenset(result)
+
+        if len(self._query_cache) > 256:
+            self._query_cache.clear()
+        self._query_cache[key] = result
+        return result
+
+    def _similarity(self, field, text):
+        grams = trigrams(text)
+        if not text or not grams:
+            return {}
+        postings = self._grams[field]
+        shared = {}
+        for gram in grams:
+            for doc in postings.get(gram, ()):
+                shared[doc] = shared.get(doc, 0) + 1
+        counts = self._gram_counts[field]
+        n = len(grams)
+        # Dice coefficient over trigram sets
+        return {doc: 2.0 * hits / (n + counts[doc]) for doc, hits in shared.items()}
+
+    def search(self, text, power_level=None, limit=None, min_score=FUZZY_MIN_SCORE):
+        """Ranked ``(score, name)`` matches for ``text``, best first."""
+        raw = text.strip()
+        norm = normalize(raw)
+        if not norm and not raw:
+            return []
+
+        scores = {}
+        for field, weight, needle in (("name", NAME_WEIGHT, norm),
+                                      ("category", CATEGORY_WEIGHT, norm),
+                                      ("id", ID_WEIGHT, raw)):
+            for doc, sim in self._similarity(field, needle).items():
+                sim *= weight
+                if sim > scores.get(doc, 0.0):
+                    scores[doc] = sim
+
+        for name in (self.query(norm) if norm else ()):
+            doc = self._doc_by_name[name]
+            bonus = EXACT_BONUS
+            if self.normalized[doc].startswith(norm):
+                bonus += PREFIX_BONUS
+            scores[doc] = scores.get(doc, 0.0) + bonus
+        doc = self._doc_by_id.get(raw)
+        if doc is not None:
+            # A pasted PersistenceID always wins
+            scores[doc] = scores.get(doc, 0.0) + EXACT_BONUS + PREFIX_BONUS + 1.0
+
+        allowed = None
+        if power_level is not None:
+            allowed = self._by_power.get(power_level, frozenset())
+        ranked = sorted(
+            ((score, self.names[doc]) for doc, score in scores.items()
+             if score >= min_score and (allowed is None or self.names[doc] in allowed)),
+            key=lambda hit: (-hit[0], hit[1]),
+        )
+        return ranked[:limit] if limit else ranked
+
+    def resolve(self, queries, min_score=FUZZY_MIN_SCORE):
+        """Map each name, partial name or PersistenceID to its best PersistenceID (or None)."""
+        resolved = {}
+        for q in queries:
+            hits = self.search(q, limit=1, min_score=min_score)
+            resolved[q] = (self.ids[self._doc_by_name[hits[0][1]]] or None) if hits else None
+        return resolved
+
+
+def load_index(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return ItemSearchIndex(json.load(f))
+
+
+def resolve_item_ids(queries, index_or_path, min_score=FUZZY_MIN_SCORE):
+    """Bulk-resolve item names (fuzzy) or PersistenceIDs to PersistenceIDs for scripts."""
+    index = index_or_path if isinstance(index_or_path, ItemSearchIndex) else load_index(index_or_path)
+    return index.resolve(queries, min_score)
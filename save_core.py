@@ -0,0 +1,723 @@
+"""Headless save editing: item catalog, slot rules and save file I/O.
+
+Nothing here imports tkinter or PIL, so scripts and the command line can
+load, edit and write character saves without a display.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from backup_store import BackupStore
+from catalog import CATALOG_FILENAME, Catalog, load_catalog
+from edit_history import MISSING, EditHistory
+from guids import GuidAllocator, collect_guids, guids_in_bytes, random_guids
+from instrument import timed
+from save_sections import RawSection, SaveFormatError, encode_section, rebuild, scan_sections, splice
+
+def resource_path(relative_path):
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, relative_path)
+
+def user_cache_dir():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "RSDragonwildsSaveEditor")
+
+ASSETS_DIR = resource_path("assets")
+UI_DIR = os.path.join(ASSETS_DIR, "UI")
+DATA_DIR = resource_path("data")
+ITEM_LIST_PATH = os.path.join(DATA_DIR, "ItemID.txt")
+CACHE_DIR = user_cache_dir()
+CATALOG_PATH = os.path.join(CACHE_DIR, CATALOG_FILENAME)
+DEFAULT_SAVE_DIR = os.path.expandvars(r"%LOCALAPPDATA%\\RSDragonwilds\\Saved\\SaveCharacters")
+
+# Inventory layout: 0-7 action bar, 8-31 main, 32-55 runes, 56-79 quest items
+ACTION_BAR_SLOTS = (0, 7)
+MAIN_SLOTS = (8, 31)
+RUNE_SLOTS = (32, 55)
+QUEST_SLOTS = (56, 79)
+INVENTORY_SLOT_COUNT = 80
+LOADOUT_SLOT_NAMES = ["Helmet", "Body", "Legs", "Cape", "Trinket"]
+# Top-level save sections the editor reads; the rest are kept as raw bytes
+EDITED_SECTIONS = ("Inventory", "Loadout")
+
+ICON_MAP, POWER_MAP, ITEM_NAME_MAP = {}, {}, {}
+CATALOG = Catalog([])
+SEARCH_INDEX = None
+_SEARCH_INDEX_LOCK = threading.Lock()
+# (size, mtime_ns) of ItemID.txt when it was last read, or None if it was missing. Kept
+# for failed reads too, so each bad or missing version is reported once rather than every poll
+_ITEM_LIST_STAT = None
+_ITEM_LIST_READ = False
+
+class SaveEditError(Exception):
+    """An edit that breaks the slot rules or has nothing to act on; the message is user-facing."""
+
+class SaveConflictError(SaveEditError):
+    """The file changed on disk in a section that also has unsaved edits."""
+
+    def __init__(self, path, sections):
+        self.sections = sorted(sections)
+        super().__init__(f"{os.path.basename(path)} was changed by another program "
+                         f"({', '.join(self.sections)} edited on both sides).")
+
+def generate_guid():
+    """A random GUID in the game's format. Inside a save, use SaveDocument.guids to also rule out duplicates."""
+    return random_guids(1)[0]
+
+@timed("load_item_list")
+def load_item_list():
+    """Load the compiled item catalog and refresh the module-level lookup maps.
+
+    Raises FileNotFoundError if ItemID.txt is missing and ValueError if it cannot be parsed.
+    """
+    global CATALOG, SEARCH_INDEX
+    catalog = _read_item_list()
+
+    # The maps share the catalog's interned strings rather than holding copies
+    ICON_MAP.clear()
+    ITEM_NAME_MAP.clear()
+    POWER_MAP.clear()
+    for record in catalog.records:
+        _map_record(record)
+
+    SLOT_RULES.clear()
+    SLOT_RULES.update(compile_slot_rules(catalog))
+    CATALOG = catalog
+    SEARCH_INDEX = None
+    return catalog
+
+def _item_list_stat():
+    try:
+        st = os.stat(ITEM_LIST_PATH)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+def _read_item_list():
+    global _ITEM_LIST_STAT, _ITEM_LIST_READ
+    _ITEM_LIST_STAT = _item_list_stat()
+    _ITEM_LIST_READ = True
+    if _ITEM_LIST_STAT is None:
+        raise FileNotFoundError(f"ItemID.txt not found in {DATA_DIR}.")
+
+    try:
+        return load_catalog(ITEM_LIST_PATH, CATALOG_PATH)
+    except Exception as e:
+        raise ValueError(f"Cannot read ItemID.txt: {e}") from e
+
+def _map_record(record):
+    pid = record.persistence_id
+    if not pid:
+        return
+    if record.icon_file:
+        ICON_MAP[pid] = record.icon_file
+    if record.name:
+        ITEM_NAME_MAP[pid] = record.name
+        if record.power_level is not None:
+            POWER_MAP[pid] = record.power_level
+
+def _unmap_record(record):
+    pid = record.persistence_id
+    if pid:
+        ICON_MAP.pop(pid, None)
+        ITEM_NAME_MAP.pop(pid, None)
+        POWER_MAP.pop(pid, None)
+
+def item_list_changed():
+    """True if ItemID.txt appeared, vanished, or was replaced or edited since it was last read (one stat() call)."""
+    if not _ITEM_LIST_READ:
+        return False
+    return _item_list_stat() != _ITEM_LIST_STAT
+
+class CatalogChange:
+    """What reloading ItemID.txt changed. Records are matched by PersistenceID (by name if they have none)."""
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        # [(old record, new record)]
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"CatalogChange(+{len(self.added)} -{len(self.removed)} ~{len(self.changed)})"
+
+    def categories(self):
+        """Item box category keys (lower-case) whose contents changed."""
+        records = self.added + self.removed + [r for pair in self.changed for r in pair]
+        return {record.category.lower() for record in records if record.name}
+
+    def icon_changed_ids(self):
+        """PersistenceIDs whose cached icons are now wrong: removed items and changed icon files."""
+        ids = {r.persistence_id for r in self.removed if r.persistence_id}
+        ids.update(old.persistence_id for old, new in self.changed
+                   if old.persistence_id and old.icon_file != new.icon_file)
+        return ids
+
+def reload_item_list():
+    """Re-read ItemID.txt into the running editor and return a CatalogChange.
+
+    Only the entries that were added, removed or changed are patched in the
+    lookup maps; the search index is dropped (and rebuilt on next use) only
+    if something changed. Raises like load_item_list, leaving the old catalog in place.
+    """
+    global CATALOG, SEARCH_INDEX
+    catalog = _read_item_list()
+    old_records = {record.persistence_id or record.name: record for record in CATALOG.records}
+    new_records = {record.persistence_id or record.name: record for record in catalog.records}
+    added = [r for key, r in new_records.items() if key not in old_records]
+    removed = [r for key, r in old_records.items() if key not in new_records]
+    changed = [(old_records[key], r) for key, r in new_records.items()
+               if key in old_records and old_records[key].fields() != r.fields()]
+    change = CatalogChange(added, removed, changed)
+
+    for record in removed:
+        _unmap_record(record)
+    for old, new in changed:
+        _unmap_record(old)
+    for record in added + [new for _, new in changed]:
+        _map_record(record)
+        if record.category not in SLOT_RULES:
+            SLOT_RULES[record.category] = SlotRule(record.category)
+    # Under the lock, so an index still being built from the old catalog cannot land afterwards
+    with _SEARCH_INDEX_LOCK:
+        CATALOG = catalog
+        if change:
+            SEARCH_INDEX = None
+    return change
+
+def search_index():
+    """The item search index, built on first use so headless callers never pay for it."""
+    global SEARCH_INDEX
+    if SEARCH_INDEX is None:
+        # The GUI may already be building it on its warm-up thread; wait for that one
+        with _SEARCH_INDEX_LOCK:
+            if SEARCH_INDEX is None:
+                from item_search import ItemSearchIndex
+                SEARCH_INDEX = ItemSearchIndex(CATALOG.records)
+    return SEARCH_INDEX
+
+def resolve_item(item, fuzzy=True):
+    """Find a catalog record by exact name, PersistenceID, or (failing both) fuzzy name match."""
+    if not isinstance(item, str):
+        return item
+    record = CATALOG.get(item) or CATALOG.by_persistence_id(item)
+    if record is None and fuzzy:
+        hits = search_index().search(item, limit=1)
+        if hits:
+            record = CATALOG.get(hits[0][1])
+    if record is None:
+        raise SaveEditError(f"Unknown item '{item}'.")
+    return record
+
+def _slot_mask(first, last):
+    return ((1 << (last - first + 1)) - 1) << first
+
+ALL_SLOTS_MASK = _slot_mask(0, INVENTORY_SLOT_COUNT - 1)
+RUNE_SLOTS_MASK = _slot_mask(*RUNE_SLOTS)
+QUEST_SLOTS_MASK = _slot_mask(*QUEST_SLOTS)
+# Category keyword -> loadout slot (0=Helmet, 1=Body, 2=Legs, 3=Cape, 4=Trinket); the first match wins
+LOADOUT_KEYWORDS = (("helmet", 0), ("body", 1), ("legs", 2), ("cape", 3), ("trinket", 4), ("amulet", 4))
+
+class SlotRule:
+    """Where items of one category may go: a bitmask over inventory slots and a set of loadout slots."""
+    __slots__ = ("slot_mask", "loadout_slots", "rune", "key_item", "known")
+
+    def __init__(self, category):
+        category_lower = category.lower() if category else ""
+        # Over half of ItemID.txt (every rune and piece of armour among them) has
+        # an empty Category, so its rule says nothing about where the item belongs
+        self.known = bool(category_lower)
+        self.rune = "rune" in category_lower
+        self.key_item = "keyitem" in category_lower
+        mask = ALL_SLOTS_MASK
+        mask &= RUNE_SLOTS_MASK if self.rune else ~RUNE_SLOTS_MASK
+        mask &= QUEST_SLOTS_MASK if self.key_item else ~QUEST_SLOTS_MASK
+        self.slot_mask = mask
+        self.loadout_slots = frozenset()
+        for keyword, loadout_index in LOADOUT_KEYWORDS:
+            if keyword in category_lower:
+                self.loadout_slots = frozenset((loadout_index,))
+                break
+
+    def allows_slot(self, slot_index):
+        return slot_index >= 0 and (self.slot_mask >> slot_index) & 1 == 1
+
+# ItemID Category (as written in the file) -> SlotRule; filled by load_item_list, extended on demand
+SLOT_RULES = {}
+
+def compile_slot_rules(catalog):
+    """Build the rule table once per catalog, one entry per distinct category."""
+    rules = {}
+    for record in catalog.records:
+        if record.category not in rules:
+            rules[record.category] = SlotRule(record.category)
+    return rules
+
+def slot_rule(item_category):
+    rule = SLOT_RULES.get(item_category)
+    if rule is None:
+        rule = SLOT_RULES[item_category] = SlotRule(item_category)
+    return rule
+
+def inventory_slot_error(rule, slot_index):
+    """The user-facing reason ``rule`` forbids ``slot_index``, or None if it is allowed."""
+    if rule.allows_slot(slot_index):
+        return None
+    in_rune_slots = RUNE_SLOTS[0] <= slot_index <= RUNE_SLOTS[1]
+    in_quest_slots = QUEST_SLOTS[0] <= slot_index <= QUEST_SLOTS[1]
+    if rule.rune and not in_rune_slots:
+        return "Runes can only be placed in Rune inventory slots (32-55)."
+    if not rule.rune and in_rune_slots:
+        return "Only runes can be placed in Rune inventory slots."
+    if rule.key_item and not in_quest_slots:
+        return "Key/Quest items can only be placed in Quest inventory slots (56-79)."
+    if not rule.key_item and in_quest_slots:
+        return "Only Key/Quest items can be placed in Quest inventory slots."
+    return f"Slot {slot_index} is outside the inventory (0-{INVENTORY_SLOT_COUNT - 1})."
+
+def check_inventory_slot(item_category, slot_index):
+    """Raise SaveEditError if an item of this category may not sit in ``slot_index``."""
+    error = inventory_slot_error(slot_rule(item_category), slot_index)
+    if error:
+        raise SaveEditError(error)
+
+def check_loadout_slot(record, loadout_index):
+    if loadout_index not in slot_rule(record.category).loadout_slots:
+        slot_name = LOADOUT_SLOT_NAMES[loadout_index] if 0 <= loadout_index < len(LOADOUT_SLOT_NAMES) else "Unknown"
+        raise SaveEditError(f"'{record.name}' cannot be equipped in the {slot_name} slot.")
+
+def clamp_count(record, count):
+    """Clamp a requested stack size to 1..MaxStackSize."""
+    max_stack = record.get("MaxStackSize", 1)
+    if count > max_stack:
+        count = max_stack
+    if count < 1:
+        count = 1
+    return count
+
+def make_inventory_entry(record, count, guid=None):
+    item_entry = {
+        "GUID": guid or generate_guid(),
+        "ItemData": record.persistence_id
+    }
+    if count > 1:
+        item_entry["Count"] = count
+    if record.get("BaseDurability"):
+        item_entry["Durability"] = record.base_durability
+    if record.get("VitalShield") is not None:
+        item_entry["VitalShield"] = record.vital_shield
+    return item_entry
+
+def make_loadout_entry(record, guid=None):
+    item_entry = {
+        "GUID": guid or generate_guid(),
+        "ItemData": record.persistence_id
+    }
+    if record.get("BaseDurability"):
+        item_entry["Durability"] = record.base_durability
+    return item_entry
+
+def atomic_write_bytes(path, payload):
+    """Write ``payload`` to a temp file beside ``path``, fsync it, then rename it into place.
+
+    A crash or full disk leaves either the old file or the new one, never a truncated mix.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            shutil.copymode(path, tmp_path)
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself on POSIX filesystems
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+def _put(mapping, key, value):
+    if value is MISSING:
+        mapping.pop(key, None)
+    else:
+        mapping[key] = value
+
+class SaveDocument:
+    """A loaded character save plus the edit operations the editor supports."""
+
+    def __init__(self, path, data, raw=None, sections=None, style=None):
+        self.path = path
+        self.data = data
+        # Top-level keys edited since the last save
+        self.changed = set()
+        # Original file bytes and the spans of their top-level values, so a save
+        # only re-encodes the sections that were edited
+        self._raw = raw if sections is not None else None
+        self._sections = sections
+        self._style = style
+        self._lazy = False
+        # (size, mtime_ns) and digest of the file as last read or written, to spot outside changes
+        self._disk_stat = None
+        self._disk_digest = None
+        self.history = EditHistory()
+        self._guids = None
+        # Chunk hashes of the file's current contents once they are in the backup store
+        self._backup_digests = None
+
+    @staticmethod
+    def _check_shape(data):
+        if not isinstance(data, dict):
+            raise SaveFormatError("Save file is not a JSON object.")
+        for key in EDITED_SECTIONS:
+            if not isinstance(data.get(key, {}), dict):
+                raise SaveFormatError(f"{key} is not a JSON object.")
+        return data
+
+    @classmethod
+    def _parse(cls, path, raw, lazy):
+        """(data, raw, sections, style) for a save's bytes; sections is None if the layout cannot be scanned."""
+        try:
+            sections, style = scan_sections(raw)
+        except SaveFormatError as e:
+            data = cls._check_shape(json.loads(raw))
+            print(f"Falling back to full rewrites for {path}: {e}")
+            return data, None, None, None
+        if not lazy:
+            return cls._check_shape(json.loads(raw)), raw, sections, style
+        view = memoryview(raw)
+        data = {}
+        for section in sections:
+            if section.key in EDITED_SECTIONS:
+                data[section.key] = json.loads(raw[section.start:section.end])
+            else:
+                data[section.key] = RawSection(view[section.start:section.end])
+        return cls._check_shape(data), raw, sections, style
+
+    @classmethod
+    @timed("SaveDocument.load")
+    def load(cls, path, lazy=True):
+        """Read a save. With ``lazy``, only EDITED_SECTIONS are decoded and the
+        other top-level values stay as RawSection slices of the file bytes."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+            st = os.fstat(f.fileno())
+        doc = cls(path, *cls._parse(path, raw, lazy))
+        doc._lazy = lazy
+        doc._remember_disk(raw, st)
+        return doc
+
+    def _remember_disk(self, raw, st):
+        self._disk_stat = (st.st_size, st.st_mtime_ns)
+        self._disk_digest = hashlib.sha1(raw).digest()
+
+    def disk_changed(self):
+        """True if the file on disk no longer holds what was last loaded or saved.
+
+        Costs one stat() unless the size or mtime moved; then the contents are hashed
+        so a touch without a real change is not reported.
+        """
+        if self._disk_stat is None:
+            return False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_size, st.st_mtime_ns) == self._disk_stat:
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return False
+        if hashlib.sha1(raw).digest() == self._disk_digest:
+            self._disk_stat = (st.st_size, st.st_mtime_ns)
+            return False
+        return True
+
+    def _section_bytes(self):
+        return {section.key: self._raw[section.start:section.end] for section in self._sections}
+
+    def reload(self):
+        """Merge the file's current contents into this document.
+
+        Sections that changed on disk replace the loaded ones unless they also
+        have unsaved edits, in which case SaveConflictError is raised and nothing
+        changes. Unsaved edits to other sections are kept. Returns the set of
+        top-level keys that were reloaded.
+        """
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+            st = os.fstat(f.fileno())
+        data, new_raw, sections, style = self._parse(self.path, raw, self._lazy)
+
+        if new_raw is not None and self._raw is not None:
+            old_bytes = self._section_bytes()
+            new_bytes = {section.key: new_raw[section.start:section.end] for section in sections}
+            on_disk = {key for key in old_bytes.keys() | new_bytes.keys() if old_bytes.get(key) != new_bytes.get(key)}
+        else:
+            # No byte spans to compare: any unsaved edit might collide
+            on_disk = {key for key in data.keys() | self.data.keys() if data.get(key) != self.data.get(key)}
+            on_disk |= self.changed
+        conflicts = on_disk & self.changed
+        if conflicts:
+            raise SaveConflictError(self.path, conflicts)
+
+        merged = {key: self.data[key] if key in self.changed else value for key, value in data.items()}
+        for key in self.changed:
+            if key in self.data and key not in merged:
+                merged[key] = self.data[key]
+        # Undo steps would replay over the reloaded sections
+        if on_disk & set(EDITED_SECTIONS):
+            self.history.clear()
+        # Update in place: the GUI holds a reference to this dict
+        self.data.clear()
+        self.data.update(merged)
+        self._raw, self._sections, self._style = new_raw, sections, style
+        self._remember_disk(raw, st)
+        self._guids = None
+        self._backup_digests = None
+        return on_disk
+
+    def revert(self):
+        """Drop unsaved edits and reload the file as it is on disk. Returns the reloaded keys."""
+        self.changed.clear()
+        self.history.clear()
+        return self.reload()
+
+    def section(self, key, default=None):
+        """A top-level value, decoding it first if it was left raw at load."""
+        value = self.data.get(key, default)
+        if isinstance(value, RawSection):
+            value = self.data[key] = value.decode()
+        return value
+
+    @property
+    def dirty(self):
+        """True while there are edits that have not been written to disk."""
+        return bool(self.changed)
+
+    def mark_changed(self, key):
+        self.changed.add(key)
+
+    @property
+    def guids(self):
+        """GuidAllocator over every GUID in the save, built on first use.
+
+        Raw sections are scanned as bytes rather than decoded; decoded sections
+        are only walked if they were edited since the file was read.
+        """
+        if self._guids is None:
+            if self._raw is not None:
+                used = guids_in_bytes(self._raw)
+                edited = [self.data.get(key) for key in self.changed]
+            else:
+                used = set()
+                edited = list(self.data.values())
+            for value in edited:
+                collect_guids(value, used)
+            self._guids = GuidAllocator(used)
+        return self._guids
+
+    @property
+    def inventory(self):
+        return self._section("Inventory")
+
+    @property
+    def loadout(self):
+        return self._section("Loadout")
+
+    def _section(self, key):
+        value = self.data.get(key, {})
+        if not isinstance(value, dict):
+            raise SaveFormatError(f"{key} is not a JSON object.")
+        return value
+
+    def _apply(self, label, changes):
+        """Apply [(section, key, new value or MISSING)] as one undoable step. Returns the step, or None if nothing changed."""
+        delta = []
+        for section, key, value in changes:
+            target = self.data.setdefault(section, {})
+            old = target.get(key, MISSING)
+            if old is value or old == value:
+                continue
+            delta.append((section, key, old, value))
+            _put(target, key, value)
+            self.mark_changed(section)
+        return self.history.push(label, delta) if delta else None
+
+    def _replay(self, step, undo):
+        for section, key, old, new in (reversed(step.changes) if undo else step.changes):
+            _put(self.data.setdefault(section, {}), key, old if undo else new)
+            self.mark_changed(section)
+
+    def undo(self):
+        """Revert the most recent edit. Returns the EditStep undone, or None."""
+        step = self.history.pop_undo()
+        if step is not None:
+            self._replay(step, undo=True)
+        return step
+
+    def redo(self):
+        """Re-apply the most recently undone edit. Returns the EditStep, or None."""
+        step = self.history.pop_redo()
+        if step is not None:
+            self._replay(step, undo=False)
+        return step
+
+    def add_item(self, slot_index, item, count=1):
+        """Place ``count`` of ``item`` in an inventory slot. Returns the new entry."""
+        record = resolve_item(item, fuzzy=False)
+        if not 0 <= slot_index < INVENTORY_SLOT_COUNT:
+            raise SaveEditError(f"Slot {slot_index} is outside the inventory (0-{INVENTORY_SLOT_COUNT - 1}).")
+        check_inventory_slot(record.category, slot_index)
+
+        inventory = self.inventory
+        item_entry = make_inventory_entry(record, clamp_count(record, count), self.guids.allocate())
+        max_idx = max([int(k) for k in inventory.keys() if k.isdigit()] + [slot_index])
+        changes = [("Inventory", str(slot_index), item_entry)]
+        changes.append(("Inventory", "MaxSlotIndex", max(inventory.get("MaxSlotIndex", 0), max_idx)))
+        self._apply(f"Add {record.name}", changes)
+        return item_entry
+
+    def fill_slots(self, start, end, item, count=1, skip_occupied=False):
+        """Place ``item`` in every inventory slot from ``start`` to ``end`` inclusive.
+
+        The range is validated once, all slots are written in memory and
+        MaxSlotIndex is updated once. Returns the list of filled slot indices.
+        """
+        record = resolve_item(item, fuzzy=False)
+        if start > end:
+            start, end = end, start
+        if start < 0 or end >= INVENTORY_SLOT_COUNT:
+            raise SaveEditError(f"Slots {start}-{end} are outside the inventory (0-{INVENTORY_SLOT_COUNT - 1}).")
+        # Each category's allowed slots form one contiguous block, so checking the ends covers the range
+        check_inventory_slot(record.category, start)
+        check_inventory_slot(record.category, end)
+
+        inventory = self.inventory
+        count = clamp_count(record, count)
+        filled = [slot_index for slot_index in range(start, end + 1)
+                  if not (skip_occupied and str(slot_index) in inventory)]
+        changes = [("Inventory", str(slot_index), make_inventory_entry(record, count, guid))
+                   for slot_index, guid in zip(filled, self.guids.allocate_many(len(filled)))]
+
+        if filled:
+            changes.append(("Inventory", "MaxSlotIndex", max(inventory.get("MaxSlotIndex", 0), filled[-1])))
+            self._apply(f"Fill {record.name}", changes)
+        return filled
+
+    def equip_item(self, loadout_index, item):
+        """Put ``item`` in an equipment slot. Returns the new entry."""
+        record = resolve_item(item, fuzzy=False)
+        check_loadout_slot(record, loadout_index)
+
+        item_entry = make_loadout_entry(record, self.guids.allocate())
+        self._apply(f"Equip {record.name}", [("Loadout", str(loadout_index), item_entry)])
+        return item_entry
+
+    def clear_slot(self, slot_index):
+        """Empty an inventory slot. Returns False if it was already empty."""
+        slot_key = str(slot_index)
+        if slot_key not in self.inventory:
+            return False
+        self._apply("Clear slot", [("Inventory", slot_key, MISSING)])
+        return True
+
+    def clear_loadout_slot(self, loadout_index):
+        """Empty an equipment slot. Returns False if it was already empty."""
+        slot_key = str(loadout_index)
+        if slot_key not in self.loadout:
+            return False
+        self._apply("Clear equipment slot", [("Loadout", slot_key, MISSING)])
+        return True
+
+    @timed("SaveDocument.save")
+    def save(self, force=False):
+        """Write the save, re-encoding only the top-level sections that were edited.
+
+        If another program changed the file since it was loaded, its changes are
+        merged in first; SaveConflictError is raised if they touch a section that
+        was also edited here. ``force`` overwrites regardless.
+        """
+        if not force and self.disk_changed():
+            self.reload()
+        backups = BackupStore.for_save(self.path)
+        if force or self._backup_digests is None:
+            # What is on disk now: the untouched original, or whatever another program wrote
+            outside = self._raw is None or (force and self.disk_changed())
+            self._backup(backups, None if outside else self._raw, None if outside else self._sections)
+            if outside:
+                # Those hashes describe the file on disk, not the buffer about to be spliced
+                self._backup_digests = None
+        if self._raw is None:
+            payload = json.dumps(self.data, indent=4).encode("utf-8")
+            atomic_write_bytes(self.path, payload)
+            self._backup(backups, payload)
+        else:
+            known = None
+            if [section.key for section in self._sections] == list(self.data):
+                replacements = {key: encode_section(self.data[key], self._style) for key in self.changed}
+                payload, sections = splice(self._raw, self._sections, replacements)
+                # Splicing keeps every other section and separator byte for byte
+                if self._backup_digests is not None:
+                    known = {k: d for k, d in self._backup_digests.items() if k not in self.changed}
+            else:
+                payload, sections = rebuild(self._raw, self._sections, self.data, self._style, self.changed)
+            atomic_write_bytes(self.path, payload)
+            self._backup(backups, payload, sections, known)
+            self._raw, self._sections = payload, sections
+            # Re-point raw sections at the new buffer so the old one can be freed
+            view = memoryview(payload)
+            for section in sections:
+                value = self.data.get(section.key)
+                if isinstance(value, RawSection):
+                    value.raw = view[section.start:section.end]
+        self.changed.clear()
+        try:
+            self._remember_disk(payload, os.stat(self.path))
+        except OSError:
+            self._disk_stat = None
+
+    def _backup(self, store, raw=None, sections=None, known=None):
+        """Add a version to the backup store, reading the file if ``raw`` is not given; failures are only reported."""
+        self._backup_digests = None
+        try:
+            if raw is None:
+                if not os.path.exists(self.path):
+                    return
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+            version = store.snapshot(self.path, raw, sections, known)
+        except (OSError, ValueError) as e:
+            print(f"Could not back up {self.path}: {e}")
+            return
+        self._backup_digests = version.keys()
+
+def load_save(path):
+    return SaveDocument.load(path)
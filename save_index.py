@@ -0,0 +1,151 @@
+"""Cross-save item index.
+
+Records, for every character save in a directory, how many of each item
+(keyed by ItemData) it holds in Inventory and Loadout. The index is kept in
+the cache directory and refreshed incrementally: only saves whose size or
+mtime changed since the last scan are parsed again. Queries run against an
+in-memory item -> saves map.
+"""
+import hashlib
+import marshal
+import os
+import tempfile
+
+from save_core import CACHE_DIR, SaveDocument
+
+INDEX_FORMAT = 1
+
+
+def index_path_for(directory):
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(directory)).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"save_index_{key}.bin")
+
+
+def count_items(doc):
+    """(inventory counts, loadout counts) by ItemData for one loaded save.
+
+    Raises ValueError for an entry whose ItemData is not a string or whose
+    Count is not a whole number.
+    """
+    inventory = {}
+    for slot_str, entry in doc.inventory.items():
+        if slot_str.isdigit() and isinstance(entry, dict) and entry.get("ItemData"):
+            item_id = _item_id(entry, "Inventory", slot_str)
+            count = entry.get("Count", 1)
+            if not isinstance(count, int) or isinstance(count, bool):
+                raise ValueError(f"Inventory slot {slot_str} has Count {count!r}.")
+            inventory[item_id] = inventory.get(item_id, 0) + count
+    loadout = {}
+    for slot_str, entry in doc.loadout.items():
+        # Entries that only point at an inventory slot are already counted there
+        if slot_str.isdigit() and isinstance(entry, dict) and entry.get("ItemData"):
+            item_id = _item_id(entry, "Loadout", slot_str)
+            loadout[item_id] = loadout.get(item_id, 0) + 1
+    return inventory, loadout
+
+
+def _item_id(entry, section, slot_str):
+    item_id = entry["ItemData"]
+    if not isinstance(item_id, str):
+        raise ValueError(f"{section} slot {slot_str} has ItemData {item_id!r}.")
+    return item_id
+
+
+class SaveIndex:
+    def __init__(self, directory, index_path=None):
+        self.directory = directory
+        self.index_path = index_path or index_path_for(directory)
+        # file name -> (size, mtime_ns, inventory counts, loadout counts, error or None)
+        self.entries = {}
+        self.by_item = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                fmt, directory, entries = marshal.loads(f.read())
+            if fmt == INDEX_FORMAT and directory == os.path.abspath(self.directory):
+                self.entries = entries
+        except (OSError, EOFError, ValueError, TypeError):
+            self.entries = {}
+        self._rebuild_lookup()
+
+    def _store(self):
+        try:
+            directory = os.path.dirname(self.index_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # A private temp file, so the GUI and a `where` run refreshing at once cannot clobber each other's
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.index_path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump((INDEX_FORMAT, os.path.abspath(self.directory), self.entries), f)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Could not write save index: {e}")
+
+    def _rebuild_lookup(self):
+        by_item = {}
+        for name, (_, _, inventory, loadout, _) in self.entries.items():
+            for item_id, count in inventory.items():
+                by_item.setdefault(item_id, {})[name] = (count, 0)
+            for item_id, count in loadout.items():
+                held = by_item.setdefault(item_id, {}).get(name, (0, 0))
+                by_item[item_id][name] = (held[0], count)
+        self.by_item = by_item
+
+    def refresh(self):
+        """Re-parse new or changed saves and forget deleted ones. Returns the number of files parsed."""
+        seen = set()
+        parsed = 0
+        try:
+            with os.scandir(self.directory) as it:
+                files = [e for e in it if e.name.endswith(".json") and not e.name.endswith("_backup.json")
+                         and e.is_file()]
+        except OSError as e:
+            print(f"Cannot scan {self.directory}: {e}")
+            files = []
+
+        for entry in files:
+            try:
+                st = entry.stat()
+            except OSError:
+                # Deleted since the scan; forgotten below like any other missing save
+                continue
+            seen.add(entry.name)
+            cached = self.entries.get(entry.name)
+            if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                continue
+            try:
+                inventory, loadout = count_items(SaveDocument.load(entry.path))
+                error = None
+            except (OSError, ValueError) as e:
+                inventory, loadout, error = {}, {}, str(e)
+            self.entries[entry.name] = (st.st_size, st.st_mtime_ns, inventory, loadout, error)
+            parsed += 1
+
+        removed = [name for name in self.entries if name not in seen]
+        for name in removed:
+            del self.entries[name]
+        if parsed or removed:
+            self._rebuild_lookup()
+            self._store()
+        return parsed
+
+    def holders(self, item_id):
+        """[(save path, inventory count, equipped count)] for saves holding ``item_id``, most first."""
+        holders = self.by_item.get(item_id, {})
+        rows = [(os.path.join(self.directory, name), inv, equipped) for name, (inv, equipped) in holders.items()]
+        rows.sort(key=lambda row: (-(row[1] + row[2]), row[0]))
+        return rows
+
+    def errors(self):
+        return {name: cached[4] for name, cached in self.entries.items() if cached[4]}
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,247 @@
+"""Byte-level access to the top-level sections of a character save.
+
+A save is one JSON object. ``scan_sections`` records where each top-level
+value starts and ends in the original bytes without decoding it, so the
+editor can re-encode just the sections it changed and splice them back in,
+leaving every other byte exactly as the game wrote it.
+"""
+import json
+import re
+
+_WS = re.compile(rb"[ \t\r\n]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+# Skips plain text and whole strings in one match, stopping at the next bracket
+_NEXT_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])', re.S)
+
+_QUOTE, _COMMA, _COLON = 0x22, 0x2C, 0x3A
+_OPEN = (0x7B, 0x5B)
+_CLOSER = {0x7B: 0x7D, 0x5B: 0x5D, _QUOTE: _QUOTE}
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+class Section:
+    """A top-level ``"key": value`` pair and the byte span of its value."""
+    __slots__ = ("key", "key_start", "start", "end")
+
+    def __init__(self, key, key_start, start, end):
+        self.key = key
+        self.key_start = key_start
+        self.start = start
+        self.end = end
+
+    def shifted(self, delta):
+        return Section(self.key, self.key_start + delta, self.start + delta, self.end + delta)
+
+
+class RawSection:
+    """A top-level value left undecoded; written back exactly as it was read."""
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __repr__(self):
+        return f"RawSection({len(self.raw)} bytes)"
+
+    def decode(self):
+        return json.loads(bytes(self.raw))
+
+
+class Style:
+    """Whitespace conventions of the original file, reused when re-encoding a section."""
+    __slots__ = ("indent", "newline", "separators")
+
+    def __init__(self, indent=None, newline="\n", separators=(",", ":")):
+        self.indent = indent
+        self.newline = newline
+        self.separators = separators
+
+
+def skip_value(buf, pos):
+    """Return the offset just past the JSON value starting at ``pos``."""
+    first = buf[pos]
+    if first == _QUOTE:
+        m = _STRING.match(buf, pos)
+        if not m:
+            raise SaveFormatError(f"Unterminated string at byte {pos}")
+        return m.end()
+    if first in _OPEN:
+        depth = 0
+        match = _NEXT_BRACKET.match
+        while True:
+            m = match(buf, pos)
+            if m is None:
+                raise SaveFormatError(f"Unbalanced brackets from byte {pos}")
+            pos = m.end()
+            if buf[pos - 1] in _OPEN:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return pos
+    m = _SCALAR.match(buf, pos)
+    if not m or m.end() == pos:
+        raise SaveFormatError(f"Expected a value at byte {pos}")
+    return m.end()
+
+
+def scan_sections(buf):
+    """Locate every top-level value without decoding it. Returns (sections, style)."""
+    pos = _WS.match(buf, 3 if buf.startswith(b"\xef\xbb\xbf") else 0).end()
+    if pos >= len(buf) or buf[pos] != 0x7B:
+        raise SaveFormatError("Save file is not a JSON object")
+    first_key = _WS.match(buf, pos + 1).end()
+    style = _detect_style(buf, pos, first_key)
+    if style.indent:
+        sections = _scan_indented(buf, first_key, style.indent)
+        if sections is not None:
+            return sections, style
+    return _scan_tokens(buf, first_key), style
+
+
+def _scan_indented(buf, first_key, indent):
+    """Fast path for pretty-printed saves.
+
+    Top-level keys are the only lines indented by exactly one level, so they
+    can be found with a single regex search instead of walking every token.
+    Returns None if the layout does not check out.
+    """
+    key_line = re.compile(rb"\n" + re.escape(indent.encode("ascii")) + rb'("[^"\\]*(?:\\.[^"\\]*)*")[ \t]*:[ \t\r\n]*')
+    matches = list(key_line.finditer(buf, first_key - len(indent) - 1))
+    if not matches or matches[0].start(1) != first_key:
+        return None
+    closing = buf.rfind(b"}")
+    sections = []
+    for i, m in enumerate(matches):
+        start = m.end()
+        if i + 1 < len(matches):
+            end = _rstrip(buf, matches[i + 1].start())
+            if buf[end - 1] != _COMMA:
+                return None
+            end = _rstrip(buf, end - 1)
+        else:
+            end = _rstrip(buf, closing)
+        if end <= start:
+            return None
+        first = buf[start]
+        if first in _CLOSER:
+            if buf[end - 1] != _CLOSER[first]:
+                return None
+        elif _SCALAR.match(buf, start).end() != end:
+            return None
+        sections.append(Section(json.loads(m.group(1)), m.start(1), start, end))
+    return sections
+
+
+def _rstrip(buf, end):
+    while buf[end - 1] in b" \t\r\n":
+        end -= 1
+    return end
+
+
+def _scan_tokens(buf, pos):
+    sections = []
+    while pos < len(buf) and buf[pos] != 0x7D:
+        key_match = _STRING.match(buf, pos)
+        if not key_match:
+            raise SaveFormatError(f"Expected a key at byte {pos}")
+        key = json.loads(key_match.group())
+        pos = _WS.match(buf, key_match.end()).end()
+        if pos >= len(buf) or buf[pos] != _COLON:
+            raise SaveFormatError(f"Expected ':' at byte {pos}")
+        start = _WS.match(buf, pos + 1).end()
+        end = skip_value(buf, start)
+        sections.append(Section(key, key_match.start(), start, end))
+        pos = _WS.match(buf, end).end()
+        if pos < len(buf) and buf[pos] == _COMMA:
+            pos = _WS.match(buf, pos + 1).end()
+    if pos >= len(buf):
+        raise SaveFormatError("Save file ends inside the top-level object")
+    return sections
+
+
+def _detect_style(buf, open_brace, first_key):
+    newline = "\r\n" if b"\r\n" in buf[:4096] else "\n"
+    key_end = _STRING.match(buf, first_key)
+    if key_end is None:
+        return Style(newline=newline)
+    after_key = buf[key_end.end():key_end.end() + 2]
+    key_sep = ": " if after_key == b": " else ":"
+    lead = buf[open_brace + 1:first_key]
+    nl = lead.rfind(b"\n")
+    if nl < 0:
+        value_end = None
+        try:
+            value_end = skip_value(buf, _WS.match(buf, key_end.end() + len(key_sep)).end())
+        except (SaveFormatError, IndexError):
+            pass
+        item_sep = ", " if value_end is not None and buf[value_end:value_end + 2] == b", " else ","
+        return Style(None, newline, (item_sep, key_sep))
+    return Style(lead[nl + 1:].decode("ascii", "replace"), newline, (",", key_sep))
+
+
+def encode_section(value, style):
+    """Encode a top-level value the way the surrounding file is formatted."""
+    if isinstance(value, RawSection):
+        return bytes(value.raw)
+    if style.indent is None:
+        return json.dumps(value, separators=style.separators).encode("utf-8")
+    text = json.dumps(value, indent=style.indent, separators=style.separators)
+    # The value sits one level deep, so every continuation line gets one extra indent
+    return text.replace("\n", style.newline + style.indent).encode("utf-8")
+
+
+def splice(buf, sections, replacements):
+    """Swap the values of ``replacements`` ({key: bytes}) into ``buf``.
+
+    Returns the new buffer and the section list with offsets updated.
+    """
+    pieces = []
+    new_sections = []
+    last = 0
+    delta = 0
+    for section in sections:
+        new_value = replacements.get(section.key)
+        if new_value is None:
+            new_sections.append(section.shifted(delta) if delta else section)
+            continue
+        pieces.append(buf[last:section.start])
+        pieces.append(new_value)
+        last = section.end
+        moved = Section(section.key, section.key_start + delta, section.start + delta,
+                        section.start + delta + len(new_value))
+        new_sections.append(moved)
+        delta += len(new_value) - (section.end - section.start)
+    pieces.append(buf[last:])
+    return b"".join(pieces), new_sections
+
+
+def rebuild(buf, sections, data, style, changed):
+    """Re-emit the whole object when top-level keys were added or removed.
+
+    Unchanged values are still copied byte-for-byte from ``buf``.
+    """
+    by_key = {section.key: section for section in sections}
+    nl = style.newline if style.indent is not None else ""
+    indent = style.indent or ""
+    parts = []
+    for key, value in data.items():
+        section = by_key.get(key)
+        if section is not None and key not in changed:
+            encoded = bytes(buf[section.start:section.end])
+        else:
+            encoded = encode_section(value, style)
+        parts.append((nl + indent + json.dumps(key) + style.separators[1]).encode("utf-8") + encoded)
+    body = style.separators[0].encode("utf-8").join(parts)
+    out = b"{" + body + (nl.encode("utf-8") if parts else b"") + b"}"
+    if buf.endswith(b"\n"):
+        out += style.newline.encode("utf-8")
+    new_sections, _ = scan_sections(out)
+    return out, new_sections
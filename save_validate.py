@@ -0,0 +1,150 @@
+"""Whole-save validation.
+
+Checks every Inventory and Loadout entry of a save in one pass against the
+compiled slot rules (``save_core.SLOT_RULES``) and the item catalog:
+
+    wrong-slot      an item in a slot its category may not use (items with an
+                    empty Category, over half of ItemID.txt, are not checked)
+    over-stack      a Count above the item's MaxStackSize (or below 1)
+    unknown-item    ItemData missing or not in ItemID.txt
+    dangling-ref    a loadout PlayerInventoryItemIndex pointing at an empty slot
+    duplicate-guid  the same GUID on more than one entry
+    bad-entry       an entry or section that is not an object, a GUID that is
+                    not a string, or a slot outside the layout
+
+Only the two edited sections are parsed, so checking a folder of thousands
+of saves is dominated by reading the files; ``validate_saves`` spreads that
+over worker processes with the kit applier's ``map_saves``.
+"""
+import save_core
+from batch_kit import map_saves
+from save_core import INVENTORY_SLOT_COUNT, LOADOUT_SLOT_NAMES, SaveDocument, slot_rule
+
+
+class Problem:
+    __slots__ = ("section", "slot", "code", "message")
+
+    def __init__(self, section, slot, code, message):
+        self.section = section
+        self.slot = slot
+        self.code = code
+        self.message = message
+
+    def __repr__(self):
+        return f"Problem({self.section!r}, {self.slot!r}, {self.code!r})"
+
+    def __str__(self):
+        if self.slot is None:
+            return f"{self.section}: {self.message}"
+        return f"{self.section} {self.slot}: {self.message}"
+
+
+def _item_label(record, item_id):
+    return f"'{record.name}'" if record is not None else f"'{item_id}'"
+
+
+def validate_document(doc):
+    """Every problem found in ``doc``'s Inventory and Loadout, in slot order."""
+    by_id = save_core.CATALOG.by_id
+    problems = []
+    guids = {}
+
+    def check_guid(section, slot, entry):
+        guid = entry.get("GUID")
+        if not guid:
+            return
+        if not isinstance(guid, str):
+            problems.append(Problem(section, slot, "bad-entry", f"GUID {guid!r} is not a string."))
+            return
+        first = guids.get(guid)
+        if first is None:
+            guids[guid] = (section, slot)
+        else:
+            problems.append(Problem(section, slot, "duplicate-guid",
+                                    f"GUID {guid} is also used by {first[0]} {first[1]}."))
+
+    def section(name):
+        value = doc.data.get(name, {}) if isinstance(doc.data, dict) else None
+        if isinstance(value, dict):
+            return value
+        problems.append(Problem(name, None, "bad-entry", "Section is not an object."))
+        return {}
+
+    def slot_keys(entries):
+        return sorted((k for k in entries if isinstance(k, str) and k.isdigit()), key=int)
+
+    def lookup(item_id):
+        return by_id.get(item_id) if isinstance(item_id, str) else None
+
+    inventory = section("Inventory")
+    for key in slot_keys(inventory):
+        entry = inventory[key]
+        slot = int(key)
+        if not isinstance(entry, dict):
+            problems.append(Problem("Inventory", slot, "bad-entry", "Entry is not an object."))
+            continue
+        check_guid("Inventory", slot, entry)
+        if slot >= INVENTORY_SLOT_COUNT:
+            problems.append(Problem("Inventory", slot, "bad-entry",
+                                    f"Slot is outside the inventory (0-{INVENTORY_SLOT_COUNT - 1})."))
+            continue
+        item_id = entry.get("ItemData")
+        record = lookup(item_id)
+        if record is None:
+            problems.append(Problem("Inventory", slot, "unknown-item",
+                                    f"Unknown item {item_id!r}." if item_id else "Entry has no ItemData."))
+            continue
+        rule = slot_rule(record.category)
+        if rule.known and not rule.allows_slot(slot):
+            problems.append(Problem("Inventory", slot, "wrong-slot",
+                                    f"{_item_label(record, item_id)} ({record.category}) may not sit in slot {slot}."))
+        count = entry.get("Count", 1)
+        max_stack = record.max_stack_size or 1
+        if not isinstance(count, int) or count < 1 or count > max_stack:
+            problems.append(Problem("Inventory", slot, "over-stack",
+                                    f"Count {count!r} for {_item_label(record, item_id)} is outside 1-{max_stack}."))
+
+    loadout = section("Loadout")
+    for key in slot_keys(loadout):
+        entry = loadout[key]
+        index = int(key)
+        if not isinstance(entry, dict):
+            problems.append(Problem("Loadout", index, "bad-entry", "Entry is not an object."))
+            continue
+        check_guid("Loadout", index, entry)
+        if index >= len(LOADOUT_SLOT_NAMES):
+            problems.append(Problem("Loadout", index, "bad-entry", "There is no such equipment slot."))
+            continue
+        item_id = entry.get("ItemData")
+        if not item_id and "PlayerInventoryItemIndex" in entry:
+            ref = str(entry["PlayerInventoryItemIndex"])
+            referenced = inventory.get(ref)
+            if not isinstance(referenced, dict):
+                problems.append(Problem("Loadout", index, "dangling-ref",
+                                        f"Points at inventory slot {ref}, which is empty."))
+                continue
+            item_id = referenced.get("ItemData")
+        record = lookup(item_id)
+        if record is None:
+            problems.append(Problem("Loadout", index, "unknown-item",
+                                    f"Unknown item {item_id!r}." if item_id else "Entry has no ItemData."))
+            continue
+        rule = slot_rule(record.category)
+        if rule.known and index not in rule.loadout_slots:
+            problems.append(Problem("Loadout", index, "wrong-slot",
+                                    f"{_item_label(record, item_id)} cannot be equipped in the "
+                                    f"{LOADOUT_SLOT_NAMES[index]} slot."))
+    return problems
+
+
+def validate_file(path):
+    """Returns (path, [Problem], error message or None)."""
+    try:
+        return path, validate_document(SaveDocument.load(path)), None
+    except (OSError, ValueError) as e:
+        return path, [], str(e)
+
+
+def validate_saves(paths, workers=None):
+    """Validate every file in ``paths``, in parallel. Yields validate_file results in order."""
+    return map_saves(validate_file, paths, workers)
@@ -0,0 +1,146 @@
+"""Persistent on-disk cache of resized icon thumbnails.
+
+Entries are raw RGBA buffers keyed by (IconFile, size, source mtime/size), so
+a warm launch can build PhotoImages without opening the source PNG at all.
+The directory is capped in bytes; least recently used entries are evicted.
+"""
+import hashlib
+import os
+import threading
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Icons the caller served from the prebuilt atlas without asking this cache;
+        # counted apart so hit_rate stays a rate over real cache lookups
+        self.atlas_hits = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _entry_path(self, source_path, icon_name, size):
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return None
+        key = f"{icon_name}|{size}|{st.st_mtime_ns}|{st.st_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".rgba")
+
+    def get(self, source_path, icon_name, size):
+        """Cached RGBA pixels, or None if absent or the source has changed."""
+        path = self._entry_path(source_path, icon_name, size)
+        pixels = None
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    pixels = f.read()
+                if len(pixels) != size * size * 4:
+                    pixels = None
+                else:
+                    os.utime(path)
+            except OSError:
+                pixels = None
+        with self._lock:
+            if pixels is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return pixels
+
+    def record_atlas_hit(self):
+        with self._lock:
+            self.atlas_hits += 1
+
+    def put(self, source_path, icon_name, size, pixels):
+        path = self._entry_path(source_path, icon_name, size)
+        if not path or len(pixels) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pixels)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Thumbnail cache write failed: {e}")
+            return
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_bytes()
+            else:
+                self._total_bytes += len(pixels)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_bytes(self):
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for e in it:
+                    if e.name.endswith(".rgba"):
+                        total += e.stat().st_size
+        except OSError:
+            pass
+        return total
+
+    def _evict(self):
+        # Drop least recently used entries until we are back under 90% of the cap
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [(e.stat().st_mtime_ns, e.stat().st_size, e.path)
+                           for e in it if e.name.endswith(".rgba")]
+        except OSError:
+            return
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    def clear(self):
+        with self._lock:
+            try:
+                with os.scandir(self.cache_dir) as it:
+                    for e in it:
+                        if e.name.endswith(".rgba"):
+                            os.remove(e.path)
+            except OSError:
+                pass
+            self._total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "atlas_hits": self.atlas_hits,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes if self._total_bytes is not None else self._scan_bytes(),
+                "max_bytes": self.max_bytes,
+            }
+
+    def report(self):
+        s = self.stats()
+        return (f"Icons: {s['atlas_hits']} from the atlas. "
+                f"Thumbnail cache: {s['hits']} hits, {s['misses']} misses "
+                f"({s['hit_rate']:.0%} hit rate), {s['writes']} writes, {s['evictions']} evictions, "
+                f"{s['bytes'] / 1048576:.1f}/{s['max_bytes'] / 1048576:.0f} MB")